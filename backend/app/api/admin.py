@@ -1,19 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import List, Optional
 import hashlib
+import os
+import uuid
 from datetime import datetime
 
-from app.core.database import get_db
-from app.models.models import Admin
-from passlib.context import CryptContext
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.core.executor import run_blocking
+from app.core.security import admin_cache, hash_password, token_cache
+from app.models.models import Admin, Document
+from app.api.auth import get_current_admin
+from app.services.chat_stats import chat_stats
+from app.services.document_processing import IMAGE_TYPES, TEXT_TYPES
+from app.services.faq_translation import faq_translation_job
+from app.services.ingestion import ingestion_service
+from app.services.message_writer import message_writer
 
 router = APIRouter()
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 class AdminCreate(BaseModel):
     username: str
     email: str
@@ -28,19 +36,66 @@ class AdminResponse(BaseModel):
     is_active: bool
     created_at: datetime
 
+class DocumentResponse(BaseModel):
+    id: int
+    filename: str
+    file_type: Optional[str]
+    language: str
+    is_processed: bool
+    status: Optional[str] = None
+    chunks: Optional[int] = None
+
+class FAQTranslationRequest(BaseModel):
+    languages: Optional[List[str]] = None  # Defaults to every supported non-English language
+
+SUPPORTED_UPLOAD_TYPES = {"pdf"} | IMAGE_TYPES | TEXT_TYPES
+
+class UploadTooLarge(Exception):
+    pass
+
+def _save_upload(source, path: str, max_bytes: int):
+    """Copy an upload to disk in 1 MiB blocks, giving up once it passes max_bytes"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    written = 0
+    try:
+        with open(path, "wb") as destination:
+            while True:
+                block = source.read(1024 * 1024)
+                if not block:
+                    break
+                written += len(block)
+                if written > max_bytes:
+                    raise UploadTooLarge()
+                destination.write(block)
+    except BaseException:
+        os.remove(path)
+        raise
+
+def _document_response(document: Document) -> DocumentResponse:
+    metadata = document.doc_metadata or {}
+    return DocumentResponse(
+        id=document.id,
+        filename=document.filename,
+        file_type=document.file_type,
+        language=document.language,
+        is_processed=document.is_processed,
+        status=metadata.get("status"),
+        chunks=metadata.get("chunks")
+    )
+
 @router.post("/admins", response_model=AdminResponse)
-async def create_admin(admin: AdminCreate, db: Session = Depends(get_db)):
+async def create_admin(admin: AdminCreate, db: AsyncSession = Depends(get_async_db)):
     """Create new admin user"""
     # Check if admin already exists
-    existing_admin = db.query(Admin).filter(
+    existing_admin = await db.scalar(select(Admin).where(
         (Admin.username == admin.username) | (Admin.email == admin.email)
-    ).first()
+    ).limit(1))
     
     if existing_admin:
         raise HTTPException(status_code=400, detail="Admin already exists")
     
     # Hash password
-    hashed_password = pwd_context.hash(admin.password)
+    hashed_password = await hash_password(admin.password)
     
     # Create admin
     db_admin = Admin(
@@ -51,13 +106,128 @@ async def create_admin(admin: AdminCreate, db: Session = Depends(get_db)):
     )
     
     db.add(db_admin)
-    db.commit()
-    db.refresh(db_admin)
+    await db.commit()
+    await db.refresh(db_admin)
     
     return db_admin
 
 @router.get("/admins", response_model=List[AdminResponse])
-async def list_admins(db: Session = Depends(get_db)):
+async def list_admins(db: AsyncSession = Depends(get_async_db)):
     """List all admin users"""
-    admins = db.query(Admin).all()
-    return admins
\ No newline at end of file
+    admins = (await db.scalars(select(Admin))).all()
+    return admins
+
+@router.post("/admins/{admin_id}/deactivate", response_model=AdminResponse)
+async def deactivate_admin(
+    admin_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_admin: Admin = Depends(get_current_admin)
+):
+    """Deactivate an admin; their tokens stop working on this worker immediately"""
+    if current_admin.role != "admin":
+        raise HTTPException(status_code=403, detail="Only admins can deactivate accounts")
+    if current_admin.id == admin_id:
+        raise HTTPException(status_code=400, detail="Admins cannot deactivate themselves")
+    
+    admin = await db.get(Admin, admin_id)
+    if not admin:
+        raise HTTPException(status_code=404, detail="Admin not found")
+    
+    if admin.is_active and admin.role == "admin":
+        # Row-locked on Postgres so two concurrent requests cannot each leave the other as the last one
+        active_admins = (await db.scalars(
+            select(Admin.id).where(Admin.is_active.is_(True), Admin.role == "admin").with_for_update()
+        )).all()
+        if len(active_admins) <= 1:
+            raise HTTPException(status_code=400, detail="Cannot deactivate the last active admin")
+    
+    admin.is_active = False
+    await db.commit()
+    await db.refresh(admin)
+    
+    admin_cache.invalidate(admin.username)
+    token_cache.forget_subject(admin.username)
+    return admin
+
+@router.post("/documents", response_model=DocumentResponse, status_code=202)
+async def upload_document(
+    file: UploadFile = File(...),
+    language: str = Form("en"),
+    db: AsyncSession = Depends(get_async_db),
+    current_admin: Admin = Depends(get_current_admin)
+):
+    """Upload a document for background extraction, chunking and indexing"""
+    file_type = os.path.splitext(file.filename or "")[1].lstrip(".").lower()
+    if file_type not in SUPPORTED_UPLOAD_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported file type: {file_type or 'unknown'}")
+    
+    # Stream the upload to disk off the event loop; large files never sit in memory
+    path = os.path.join(settings.UPLOAD_DIR, f"{uuid.uuid4().hex}.{file_type}")
+    try:
+        await run_blocking(_save_upload, file.file, path, settings.MAX_UPLOAD_MB * 1024 * 1024)
+    except UploadTooLarge:
+        raise HTTPException(status_code=413, detail=f"File is larger than {settings.MAX_UPLOAD_MB} MB")
+    
+    document = Document(
+        filename=file.filename,
+        file_type=file_type,
+        language=language,
+        is_processed=False,
+        doc_metadata={"status": "queued", "path": path}
+    )
+    db.add(document)
+    await db.commit()
+    
+    # Extraction and OCR run in the ingestion worker processes
+    ingestion_service.submit(document.id, path, file_type)
+    
+    return _document_response(document)
+
+@router.get("/documents/{document_id}", response_model=DocumentResponse)
+async def get_document_status(
+    document_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_admin: Admin = Depends(get_current_admin)
+):
+    """Get ingestion status of an uploaded document"""
+    document = await db.get(Document, document_id)
+    if not document:
+        raise HTTPException(status_code=404, detail="Document not found")
+    
+    return _document_response(document)
+
+@router.post("/stats/reconcile")
+async def reconcile_chat_stats(
+    db: AsyncSession = Depends(get_async_db),
+    current_admin: Admin = Depends(get_current_admin)
+):
+    """Rebuild the chat statistics counters from the conversations and messages tables"""
+    # Queued rows would otherwise be counted twice: once now, once when flushed
+    await message_writer.flush()
+    return await chat_stats.reconcile(db)
+
+@router.post("/faqs/translations", status_code=202)
+async def start_faq_translation(
+    request: FAQTranslationRequest = FAQTranslationRequest(),
+    current_admin: Admin = Depends(get_current_admin)
+):
+    """Translate every missing FAQ question/answer column from English in the background"""
+    languages = request.languages
+    if languages is not None:
+        unsupported = [language for language in languages if language == "en" or language not in settings.SUPPORTED_LANGUAGES]
+        if unsupported:
+            raise HTTPException(status_code=400, detail=f"Unsupported target languages: {', '.join(unsupported)}")
+    if faq_translation_job.running:
+        raise HTTPException(status_code=409, detail="FAQ translation is already running")
+    return faq_translation_job.start(languages)
+
+@router.get("/faqs/translations")
+async def get_faq_translation_status(
+    db: AsyncSession = Depends(get_async_db),
+    current_admin: Admin = Depends(get_current_admin)
+):
+    """Status of the last FAQ translation run and current coverage per language"""
+    return {
+        "job": faq_translation_job.status(),
+        "coverage": await faq_translation_job.coverage(db)
+    }
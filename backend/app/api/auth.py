@@ -1,18 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.core.config import settings
+from app.core.security import admin_cache, token_cache, verify_password
 from app.models.models import Admin
 
 router = APIRouter()
 security = HTTPBearer()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 class LoginRequest(BaseModel):
     username: str
@@ -23,9 +23,6 @@ class Token(BaseModel):
     token_type: str
     expires_in: int
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
-
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -33,11 +30,12 @@ def create_access_token(data: dict):
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 @router.post("/login", response_model=Token)
-async def login(request: LoginRequest, db: Session = Depends(get_db)):
+async def login(request: LoginRequest, db: AsyncSession = Depends(get_async_db)):
     """Admin login"""
-    admin = db.query(Admin).filter(Admin.username == request.username).first()
+    admin = await db.scalar(select(Admin).where(Admin.username == request.username))
     
-    if not admin or not verify_password(request.password, admin.hashed_password):
+    # bcrypt runs on its own thread pool, never on the event loop
+    if not admin or not await verify_password(request.password, admin.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -60,9 +58,13 @@ async def login(request: LoginRequest, db: Session = Depends(get_db)):
 
 async def get_current_admin(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Admin:
-    """Get current authenticated admin"""
+    """Get current authenticated admin
+
+    Verified tokens and Admin rows are cached, so a repeat request with the
+    same token costs no signature check and no query.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -70,15 +72,23 @@ async def get_current_admin(
     )
     
     try:
-        payload = jwt.decode(credentials.credentials, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = token_cache.verify(credentials.credentials)
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
     
-    admin = db.query(Admin).filter(Admin.username == username).first()
+    admin = admin_cache.get(username)
     if admin is None:
+        admin = await db.scalar(select(Admin).where(Admin.username == username))
+        if admin is None:
+            raise credentials_exception
+        # Detached, with every column loaded, so it can be shared across requests
+        db.expunge(admin)
+        admin_cache.set(username, admin)
+    
+    if not admin.is_active:
         raise credentials_exception
     
     return admin
\ No newline at end of file
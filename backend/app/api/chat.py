@@ -1,15 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import literal, select, tuple_
 from pydantic import BaseModel
-from typing import Optional, Dict, List
+from typing import AsyncIterator, Iterable, Optional, Dict, List, Set, Tuple
+import json
+import re
+import time
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 
-from app.core.database import get_db
-from app.core.multilingual_nlu import MultilingualNLU
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.core.deadline import Deadline
+from app.core.metrics import response_latency
+from app.core.text_normalization import normalization_stats
+from app.core.translation import translation_service
 from app.core.multilingual_retrieval import MultilingualRetrievalPipeline
 from app.models.models import Conversation, Message, ChatSession
-from app.services.context_manager import ContextManager, ResponseGenerator
+from app.services.answer_cache import answer_cache
+from app.services.chat_stats import chat_stats
+from app.services.container import services
+from app.services.message_writer import message_writer
 
 router = APIRouter()
 
@@ -32,107 +44,200 @@ class ChatResponse(BaseModel):
     escalate: bool = False
     suggestions: Optional[List[str]] = None
     intent: str
+    degraded_stages: Optional[List[str]] = None  # Stages skipped to meet the latency budget
+
+class BatchChatRequest(BaseModel):
+    messages: List[ChatRequest]
+
+class BatchChatItem(BaseModel):
+    index: int
+    response: Optional[ChatResponse] = None
+    error: Optional[str] = None
+
+class BatchChatResponse(BaseModel):
+    results: List[BatchChatItem]
+    processed: int
+    failed: int
 
 class ConversationHistory(BaseModel):
     conversation_id: str
     messages: List[Dict]
-    total_messages: int
+    total_messages: int  # Messages in this page
     language: str
     status: str
+    has_more: bool = False  # More messages beyond this page in the requested direction
+    before: Optional[int] = None  # Cursor for the previous (older) page
+    after: Optional[int] = None  # Cursor for the next (newer) page
 
-# Initialize services
-nlu_engine = MultilingualNLU()
-response_generator = ResponseGenerator()
+def _message_row(conversation_id: str, sender: str, text: str, nlu_result: Dict, confidence: float, source: Optional[str], response_time_ms: Optional[int] = None) -> Dict:
+    """Column values for a queued Message insert (every row carries the same keys)"""
+    return {
+        "conversation_id": conversation_id,
+        "sender": sender,
+        "message_text": text,
+        "intent": nlu_result["intent"],
+        "confidence": confidence,
+        "response_source": source,
+        "response_time_ms": response_time_ms,
+        "language": nlu_result["language"],
+        "created_at": datetime.now(timezone.utc)
+    }
 
-@router.post("/message", response_model=ChatResponse)
-async def chat_message(
-    request: ChatRequest,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
-):
-    """Process chat message and return multilingual response"""
+# Columns returned by the history endpoint, selected without hydrating ORM objects
+HISTORY_COLUMNS = (
+    Message.id,
+    Message.sender,
+    Message.message_text,
+    Message.intent,
+    Message.confidence,
+    Message.response_source,
+    Message.created_at,
+    Message.language
+)
+
+# Words per SSE "answer" event
+STREAM_CHUNK_WORDS = 8
+
+def _conversation_rows(request: ChatRequest) -> Tuple[str, List[Tuple[type, Dict]]]:
+    """Conversation id for a request, plus the rows that create it when it is new"""
+    if request.conversation_id:
+        return request.conversation_id, []
     
     # Generate conversation ID if not provided
-    if not request.conversation_id:
-        conversation_id = str(uuid.uuid4())
-        # Create new conversation
-        conversation = Conversation(
-            id=conversation_id,
-            user_id=request.user_id or "anonymous",
-            platform=request.platform,
-            language=request.language or "en"
-        )
-        db.add(conversation)
-        
-        # Create chat session for web widget
-        if request.platform == "web" and request.website_domain:
-            chat_session = ChatSession(
-                id=conversation_id,
-                user_id=request.user_id or "anonymous",
-                website_domain=request.website_domain,
-                language_preference=request.language or "en"
-            )
-            db.add(chat_session)
-        
-        db.commit()
-    else:
-        conversation_id = request.conversation_id
+    conversation_id = str(uuid.uuid4())
     
-    # Process with multilingual NLU
-    nlu_result = nlu_engine.process_query(request.message, request.language)
+    # Create new conversation
+    rows = [(Conversation, {
+        "id": conversation_id,
+        "user_id": request.user_id or "anonymous",
+        "platform": request.platform,
+        "language": request.language or "en",
+        "status": "active",
+        "created_at": datetime.now(timezone.utc)
+    })]
     
-    # Get context
-    context_manager = ContextManager(db, conversation_id)
-    context = context_manager.get_context()
+    # Create chat session for web widget
+    if request.platform == "web" and request.website_domain:
+        rows.append((ChatSession, {
+            "id": conversation_id,
+            "user_id": request.user_id or "anonymous",
+            "website_domain": request.website_domain,
+            "language_preference": request.language or "en",
+            "is_active": True,
+            "created_at": datetime.now(timezone.utc),
+            "last_activity": datetime.now(timezone.utc)
+        }))
     
-    # Retrieve answer with multilingual support
-    retrieval_pipeline = MultilingualRetrievalPipeline(db)
-    search_result = retrieval_pipeline.search(
-        query=nlu_result["text_en"],  # Use English for search
-        intent=nlu_result["intent"],
-        language=nlu_result["language"]  # Return response in user's language
-    )
+    return conversation_id, rows
+
+async def _missing_conversations(db: AsyncSession, conversation_ids: Iterable[str]) -> Set[str]:
+    """Referenced conversation ids that do not exist, so they fail before reaching the writer"""
+    ids = set(conversation_ids)
+    if not ids:
+        return set()
+    query = select(Conversation.id).where(Conversation.id.in_(ids))
+    missing = ids - set((await db.scalars(query)).all())
+    if missing:
+        # A conversation started moments ago may still be in the write-behind queue
+        await message_writer.flush()
+        missing -= set((await db.scalars(query)).all())
+    return missing
+
+async def _require_conversation(db: AsyncSession, request: ChatRequest):
+    if request.conversation_id and await _missing_conversations(db, [request.conversation_id]):
+        raise HTTPException(status_code=404, detail="Conversation not found")
+
+
+async def _process_message(
+    request: ChatRequest,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession,
+    endpoint: str
+) -> AsyncIterator[Tuple[str, Dict]]:
+    """Run the chat pipeline, yielding ("nlu", ...) as soon as it is known and ("response", ...) last"""
+    start = time.perf_counter()
+    deadline = Deadline.for_request()
     
-    # Generate final response
-    final_response = response_generator.generate_response(
-        search_result=search_result,
-        context=context,
-        nlu_result=nlu_result
-    )
+    # Rows are handed to the write-behind queue once the answer is ready
+    conversation_id, pending_rows = _conversation_rows(request)
     
-    # Save user message
-    user_message = Message(
-        conversation_id=conversation_id,
-        sender="user",
-        message_text=request.message,
-        intent=nlu_result["intent"],
-        confidence=nlu_result["confidence"],
-        language=nlu_result["language"]
-    )
-    db.add(user_message)
+    # Language and intent first; they are part of the answer cache key
+    nlu_result = await services.nlu.analyze(request.message, request.language)
+    deadline.language = nlu_result["language"]
+    yield "nlu", {
+        "conversation_id": conversation_id,
+        "language": nlu_result["language"],
+        "detected_language": nlu_result["detected_language"],
+        "intent": nlu_result["intent"]
+    }
     
-    # Save bot response
-    bot_message = Message(
-        conversation_id=conversation_id,
-        sender="bot",
-        message_text=final_response["response"],
-        intent=nlu_result["intent"],
-        confidence=search_result["confidence"],
-        response_source=search_result["source"],
-        language=nlu_result["language"]
-    )
-    db.add(bot_message)
+    cached = await answer_cache.get(request.message, nlu_result["language"], nlu_result["intent"])
+    if cached:
+        # Repeat question against unchanged content: skip translation and retrieval
+        search_result = cached["search_result"]
+        final_response = cached["final_response"]
+    else:
+        generation = answer_cache.generation.current
+        
+        # Translate to English for backend processing if needed
+        await services.nlu.to_english(nlu_result, deadline)
+        
+        # Get context
+        context = await services.context.get_context(conversation_id)
+        
+        # Retrieve answer with multilingual support
+        search_result = await services.retrieval.search(
+            db,
+            query=nlu_result["text_en"],  # Use English for search
+            intent=nlu_result["intent"],
+            language=nlu_result["language"],  # Return response in user's language
+            deadline=deadline
+        )
+        
+        # Generate final response
+        final_response = services.responses.generate_response(
+            search_result=search_result,
+            context=context,
+            nlu_result=nlu_result
+        )
+        
+        # Tagged with the generation seen before retrieval, so an edit that lands
+        # mid-request leaves this entry already stale. Answers degraded to meet
+        # the deadline are served once but not cached.
+        if not deadline.degraded:
+            await answer_cache.set(
+                request.message,
+                nlu_result["language"],
+                nlu_result["intent"],
+                {"search_result": search_result, "final_response": final_response},
+                generation
+            )
+    
+    # Time to answer, excluding persistence (which is write-behind anyway)
+    elapsed = time.perf_counter() - start
+    response_latency.observe(elapsed, endpoint, nlu_result["language"], search_result["source"])
+    if deadline.degraded:
+        print(f"Chat request degraded ({endpoint}, {nlu_result['language']}, {elapsed * 1000:.0f}ms): skipped {', '.join(deadline.skipped_stages())}")
     
-    db.commit()
+    # Save user message and bot response without waiting on the commit
+    pending_rows.append((Message, _message_row(
+        conversation_id, "user", request.message, nlu_result, nlu_result["confidence"], None
+    )))
+    pending_rows.append((Message, _message_row(
+        conversation_id, "bot", final_response["response"], nlu_result, search_result["confidence"], search_result["source"],
+        round(elapsed * 1000)
+    )))
+    await message_writer.enqueue(pending_rows)
     
     # Update context in background
     background_tasks.add_task(
-        context_manager.update_context,
+        services.context.update_context,
+        conversation_id,
         nlu_result,
         search_result
     )
     
-    return ChatResponse(
+    yield "response", ChatResponse(
         response=final_response["response"],
         conversation_id=conversation_id,
         confidence=search_result["confidence"],
@@ -141,34 +246,258 @@ async def chat_message(
         detected_language=nlu_result["detected_language"],
         escalate=search_result.get("escalate", False),
         suggestions=final_response.get("suggestions"),
-        intent=nlu_result["intent"]
+        intent=nlu_result["intent"],
+        degraded_stages=deadline.skipped_stages()
+    ).model_dump()
+
+@router.post("/message", response_model=ChatResponse)
+async def chat_message(
+    request: ChatRequest,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Process chat message and return multilingual response"""
+    await _require_conversation(db, request)
+    async for event, data in _process_message(request, background_tasks, db, "message"):
+        if event == "response":
+            return ChatResponse(**data)
+
+def _sse(event: str, data: Dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def _answer_chunks(text: str, words_per_chunk: int = STREAM_CHUNK_WORDS) -> List[str]:
+    """Split an answer into word groups, keeping the original whitespace"""
+    words = re.findall(r"\S+\s*", text)
+    return [
+        "".join(words[i:i + words_per_chunk])
+        for i in range(0, len(words), words_per_chunk)
+    ] or [text]
+
+@router.post("/message/stream")
+async def chat_message_stream(
+    request: ChatRequest,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Process chat message, streaming Server-Sent Events as each stage finishes
+
+    Events, in order: nlu (conversation id, language, intent), answer (one per
+    chunk of text), suggestions, then done (the full ChatResponse).
+    """
+    # Checked before the stream starts, so an unknown conversation is a plain 404
+    await _require_conversation(db, request)
+    
+    async def events():
+        try:
+            async for event, data in _process_message(request, background_tasks, db, "stream"):
+                if event == "nlu":
+                    yield _sse("nlu", data)
+                    continue
+                for chunk in _answer_chunks(data["response"]):
+                    yield _sse("answer", {"text": chunk})
+                yield _sse("suggestions", {
+                    "suggestions": data["suggestions"] or [],
+                    "confidence": data["confidence"],
+                    "source": data["source"],
+                    "escalate": data["escalate"]
+                })
+                yield _sse("done", data)
+        except Exception as e:
+            print(f"Chat stream error: {e}")
+            yield _sse("error", {"detail": "Failed to process message"})
+    
+    # Background tasks registered while streaming run once the stream ends
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
+@router.post("/message/batch", response_model=BatchChatResponse)
+async def chat_message_batch(
+    batch: BatchChatRequest,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Process a burst of gateway messages together and return results in order
+
+    NLU, the answer cache, retrieval and persistence each run once for the
+    whole batch. A message that fails gets an error entry instead of failing
+    the batch.
+    """
+    start = time.perf_counter()
+    deadline = Deadline.for_request()
+    requests = batch.messages
+    if len(requests) > settings.MAX_CHAT_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"At most {settings.MAX_CHAT_BATCH_SIZE} messages per batch")
+    
+    results = [BatchChatItem(index=i) for i in range(len(requests))]
+    for i, request in enumerate(requests):
+        if not request.message.strip():
+            results[i].error = "Empty message"
+    
+    # One query for every referenced conversation; unknown ids fail their item
+    # here instead of the batch's INSERT
+    missing = await _missing_conversations(db, {
+        request.conversation_id for request in requests if request.conversation_id
+    })
+    for i, request in enumerate(requests):
+        if results[i].error is None and request.conversation_id in missing:
+            results[i].error = "Conversation not found"
+    
+    # Language and intent for every message, repeated texts analyzed once
+    valid = [i for i in range(len(requests)) if results[i].error is None]
+    analyzed = await services.nlu.analyze_batch(
+        [requests[i].message for i in valid],
+        [requests[i].language for i in valid]
+    )
+    nlu_results = dict(zip(valid, analyzed))
+    
+    # One MGET for all cached answers
+    cached = await answer_cache.get_many([
+        (requests[i].message, nlu_results[i]["language"], nlu_results[i]["intent"]) for i in valid
+    ])
+    answers = {i: response for i, response in zip(valid, cached) if response}
+    misses = [i for i in valid if i not in answers]
+    
+    if misses:
+        generation = answer_cache.generation.current
+        await services.nlu.to_english_batch([nlu_results[i] for i in misses], deadline)
+        
+        try:
+            search_results = await services.retrieval.search_batch(db, [
+                (nlu_results[i]["text_en"], nlu_results[i]["intent"], nlu_results[i]["language"]) for i in misses
+            ], deadline)
+        except Exception as e:
+            print(f"Batch retrieval error: {e}")
+            search_results = [None] * len(misses)
+        
+        fresh = []
+        for i, search_result in zip(misses, search_results):
+            if search_result is None:
+                results[i].error = "Retrieval failed"
+                continue
+            # The response generator does not use conversation context yet
+            final_response = services.responses.generate_response(
+                search_result=search_result,
+                context={},
+                nlu_result=nlu_results[i]
+            )
+            answers[i] = {"search_result": search_result, "final_response": final_response}
+            fresh.append(((requests[i].message, nlu_results[i]["language"], nlu_results[i]["intent"]), answers[i]))
+        if not deadline.degraded:
+            await answer_cache.set_many(fresh, generation)
+    
+    # Every message in a batch is answered after the same elapsed time
+    elapsed = time.perf_counter() - start
+    if deadline.degraded:
+        print(f"Chat batch degraded ({len(misses)} retrieved, {elapsed * 1000:.0f}ms): skipped {', '.join(deadline.skipped_stages())}")
+    
+    # Every answered message is persisted in a single transaction
+    rows = []
+    retrieved, skipped = set(misses), deadline.skipped_stages()
+    for i in sorted(answers):
+        request, nlu_result = requests[i], nlu_results[i]
+        search_result, final_response = answers[i]["search_result"], answers[i]["final_response"]
+        response_latency.observe(elapsed, "batch", nlu_result["language"], search_result["source"])
+        conversation_id, conversation_rows = _conversation_rows(request)
+        rows.extend(conversation_rows)
+        rows.append((Message, _message_row(
+            conversation_id, "user", request.message, nlu_result, nlu_result["confidence"], None
+        )))
+        rows.append((Message, _message_row(
+            conversation_id, "bot", final_response["response"], nlu_result, search_result["confidence"], search_result["source"],
+            round(elapsed * 1000)
+        )))
+        results[i].response = ChatResponse(
+            response=final_response["response"],
+            conversation_id=conversation_id,
+            confidence=search_result["confidence"],
+            source=search_result["source"],
+            language=nlu_result["language"],
+            detected_language=nlu_result["detected_language"],
+            escalate=search_result.get("escalate", False),
+            suggestions=final_response.get("suggestions"),
+            intent=nlu_result["intent"],
+            # The batch shares one deadline; cached answers skipped nothing
+            degraded_stages=skipped if i in retrieved else None
+        )
+        background_tasks.add_task(
+            services.context.update_context,
+            conversation_id,
+            nlu_result,
+            search_result
+        )
+    
+    if rows:
+        try:
+            await message_writer.write(rows)
+        except Exception as e:
+            print(f"Batch persistence error: {e}")
+            raise HTTPException(status_code=500, detail="Failed to save messages")
+    
+    failed = sum(item.error is not None for item in results)
+    return BatchChatResponse(results=results, processed=len(results) - failed, failed=failed)
+
 @router.get("/conversation/{conversation_id}", response_model=ConversationHistory)
 async def get_conversation(
     conversation_id: str,
-    db: Session = Depends(get_db)
+    before: Optional[int] = Query(None, description="Return messages older than this message id"),
+    after: Optional[int] = Query(None, description="Return messages newer than this message id"),
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get conversation history"""
-    conversation = db.query(Conversation).filter(
-        Conversation.id == conversation_id
-    ).first()
+    """Get one page of conversation history (the latest messages by default)"""
+    if before is not None and after is not None:
+        raise HTTPException(status_code=400, detail="Use either before or after, not both")
+    
+    # Rows from the latest messages may still be queued for write-behind
+    await message_writer.flush()
+    conversation = (await db.execute(
+        select(Conversation.language, Conversation.status).where(Conversation.id == conversation_id)
+    )).first()
     
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
     
+    # Keyset pagination on (created_at, id): each page is a bounded range scan of
+    # ix_messages_conversation_created_id, however long the conversation is
+    position = tuple_(Message.created_at, Message.id)
+    query = select(*HISTORY_COLUMNS).where(Message.conversation_id == conversation_id)
+    cursor = after if after is not None else before
+    if cursor is not None:
+        cursor_created_at = (
+            select(Message.created_at)
+            .where(Message.id == cursor, Message.conversation_id == conversation_id)
+            .scalar_subquery()
+        )
+        cursor_position = tuple_(cursor_created_at, literal(cursor))
+        query = query.where(position > cursor_position if after is not None else position < cursor_position)
+    
+    if after is not None:
+        query = query.order_by(Message.created_at, Message.id)
+    else:
+        query = query.order_by(Message.created_at.desc(), Message.id.desc())
+    
+    # One extra row tells whether another page exists
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if after is None:
+        rows.reverse()
+    
     messages = [
         {
-            "id": msg.id,
-            "sender": msg.sender,
-            "message": msg.message_text,
-            "intent": msg.intent,
-            "confidence": msg.confidence,
-            "source": msg.response_source,
-            "timestamp": msg.created_at.isoformat(),
-            "language": msg.language
+            "id": row.id,
+            "sender": row.sender,
+            "message": row.message_text,
+            "intent": row.intent,
+            "confidence": row.confidence,
+            "source": row.response_source,
+            "timestamp": row.created_at.isoformat(),
+            "language": row.language
         }
-        for msg in conversation.messages
+        for row in rows
     ]
     
     return ConversationHistory(
@@ -176,7 +505,10 @@ async def get_conversation(
         messages=messages,
         total_messages=len(messages),
         language=conversation.language,
-        status=conversation.status
+        status=conversation.status,
+        has_more=has_more,
+        before=messages[0]["id"] if messages else before,
+        after=messages[-1]["id"] if messages else after
     )
 
 @router.post("/feedback")
@@ -185,7 +517,7 @@ async def submit_feedback(
     message_id: int,
     rating: int,
     feedback: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Submit feedback for bot response"""
     if rating < 1 or rating > 5:
@@ -200,18 +532,17 @@ async def submit_feedback(
 async def escalate_conversation(
     conversation_id: str,
     reason: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Escalate conversation to human agent"""
-    conversation = db.query(Conversation).filter(
-        Conversation.id == conversation_id
-    ).first()
+    await message_writer.flush()
+    conversation = await db.get(Conversation, conversation_id)
     
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
     
     conversation.status = "escalated"
-    db.commit()
+    await db.commit()
     
     # Here you would implement notification logic to alert human agents
     # Could integrate with email, Slack, WhatsApp etc.
@@ -251,7 +582,7 @@ async def translate_message(
 ):
     """Translate message to target language"""
     try:
-        translated = nlu_engine.translate_text(text, target_language)
+        translated = await services.nlu.translate_text(text, target_language, source_language)
         return {
             "original_text": text,
             "translated_text": translated,
@@ -261,29 +592,50 @@ async def translate_message(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Translation failed: {str(e)}")
 
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """Get hit/miss counters for the in-process caches"""
+    query_cache = MultilingualRetrievalPipeline.cache_stats
+    lookups = query_cache["hits"] + query_cache["misses"]
+    return {
+        "translation": translation_service.cache.stats(),
+        "query": {
+            "hits": query_cache["hits"],
+            "misses": query_cache["misses"],
+            "hit_rate": round(query_cache["hits"] / lookups, 4) if lookups else 0.0
+        },
+        "answer": answer_cache.stats(),
+        "normalization": normalization_stats.stats()
+    }
+
+@router.get("/persistence/stats")
+async def get_persistence_stats():
+    """Get write-behind queue depth, batch sizes and backpressure counters"""
+    return message_writer.stats()
+
+@router.get("/nlu/stats")
+async def get_nlu_stats():
+    """Get language detection tier hit rates"""
+    return {
+        "language_detection": services.nlu.language_detector.stats()
+    }
+
 @router.get("/stats")
-async def get_chat_stats(db: Session = Depends(get_db)):
-    """Get basic chat statistics"""
-    from sqlalchemy import func
-    
-    total_conversations = db.query(func.count(Conversation.id)).scalar()
-    total_messages = db.query(func.count(Message.id)).scalar()
-    
-    # Language distribution
-    language_stats = db.query(
-        Conversation.language, 
-        func.count(Conversation.language)
-    ).group_by(Conversation.language).all()
+async def get_chat_stats(
+    hours: Optional[int] = Query(None, ge=1, le=settings.STATS_HOURLY_RETENTION_DAYS * 24, description="Only the last N hours"),
+    days: Optional[int] = Query(None, ge=1, le=settings.STATS_DAILY_RETENTION_DAYS, description="Only the last N days"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get basic chat statistics from the incrementally maintained counters
+
+    While Redis is unreachable the same figures come from the tables, flagged "degraded".
+    """
+    if hours is not None and days is not None:
+        raise HTTPException(status_code=400, detail="Use either hours or days, not both")
     
-    # Intent distribution
-    intent_stats = db.query(
-        Message.intent,
-        func.count(Message.intent)
-    ).filter(Message.sender == "user").group_by(Message.intent).all()
+    if hours is None and days is None:
+        return await chat_stats.totals(db)
     
-    return {
-        "total_conversations": total_conversations,
-        "total_messages": total_messages,
-        "language_distribution": {lang: count for lang, count in language_stats},
-        "popular_intents": {intent: count for intent, count in intent_stats}
-    }
\ No newline at end of file
+    stats = await chat_stats.window(db, hours=hours, days=days)
+    stats["window"] = {"hours": hours} if hours is not None else {"days": days}
+    return stats
@@ -0,0 +1,157 @@
+from typing import Awaitable, Callable, Coroutine, Dict, List, Optional, Set, Tuple
+import asyncio
+
+import redis
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import redis_client
+from app.models.models import FAQ, Document, DocumentChunk
+
+GENERATION_KEY = "content:generation"
+
+# Rows whose changes can alter an answer, and the search index each one feeds
+CONTENT_SCOPES = ((FAQ, "faq"), (Document, "documents"), (DocumentChunk, "documents"))
+CONTENT_MODELS = tuple(model for model, _ in CONTENT_SCOPES)
+
+# Per-scope counters, so workers rebuild only the index whose rows changed
+SCOPE_KEYS = {"faq": "content:generation:faq", "documents": "content:generation:documents"}
+
+
+def _scopes_of(objects) -> Set[str]:
+    return {scope for obj in objects for model, scope in CONTENT_SCOPES if isinstance(obj, model)}
+
+
+class ContentGeneration:
+    """Shared counter bumped on every FAQ/Document change; caches key their entries on it"""
+
+    def __init__(self, debounce_ms: int = 1000):
+        self.redis_client = redis_client
+        self.current = 0
+        self.debounce = debounce_ms / 1000
+        self._scope_generations: Dict[str, int] = dict.fromkeys(SCOPE_KEYS, 0)
+        self._listeners: List[Tuple[Optional[str], Callable[[], Awaitable[None]]]] = []
+        self._refresh_lock = asyncio.Lock()
+        self._refresh_pending = False
+        self._tasks: Set[asyncio.Task] = set()
+
+    def add_listener(self, callback: Callable[[], Awaitable[None]], scope: Optional[str] = None):
+        """Register a coroutine to run (debounced, coalesced) when content in scope changes; None means any"""
+        self._listeners.append((scope, callback))
+
+    def spawn(self, coroutine: Coroutine) -> asyncio.Task:
+        """Run a coroutine in the background, keeping a reference and logging its failure"""
+        task = asyncio.get_running_loop().create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+        return task
+
+    def _task_done(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Generation task error: {task.exception()}")
+
+    async def _read_scopes(self) -> Dict[str, int]:
+        values = await self.redis_client.mget(list(SCOPE_KEYS.values()))
+        return {scope: int(value or 0) for scope, value in zip(SCOPE_KEYS, values)}
+
+    async def sync(self) -> int:
+        """Adopt the shared generation without notifying listeners (used at startup)"""
+        try:
+            self.current = int(await self.redis_client.get(GENERATION_KEY) or 0)
+            self._scope_generations = await self._read_scopes()
+        except Exception as e:
+            print(f"Generation sync error: {e}")
+        return self.current
+
+    async def bump(self, scopes: Optional[Set[str]] = None) -> int:
+        """Invalidate every cached answer in O(1) and mark the changed scopes (all by default)"""
+        scopes = SCOPE_KEYS if scopes is None else scopes
+        try:
+            async with self.redis_client.pipeline(transaction=True) as pipe:
+                pipe.incr(GENERATION_KEY)
+                for scope in scopes:
+                    pipe.incr(SCOPE_KEYS[scope])
+                generation, *_ = await pipe.execute()
+            self.observe(generation)
+        except Exception as e:
+            print(f"Generation bump error: {e}")
+        return self.current
+
+    def observe(self, generation: int):
+        """Record a generation seen in Redis; a newer one triggers the listeners"""
+        if generation > self.current:
+            self.current = generation
+            self.spawn(self._notify())
+
+    async def _notify(self):
+        # Bumps arrive in bursts (bulk FAQ translation, multi-chunk ingestion):
+        # wait out the burst, then rebuild each changed index once
+        self._refresh_pending = True
+        if self._refresh_lock.locked():
+            return
+        async with self._refresh_lock:
+            while self._refresh_pending:
+                self._refresh_pending = False
+                await asyncio.sleep(self.debounce)
+                try:
+                    seen = await self._read_scopes()
+                    changed = {scope for scope, generation in seen.items() if generation > self._scope_generations[scope]}
+                    self._scope_generations = seen
+                except Exception as e:
+                    # Without the scope counters, assume everything changed
+                    print(f"Generation scope read error: {e}")
+                    changed = set(SCOPE_KEYS)
+                for scope, callback in self._listeners:
+                    if scope is not None and scope not in changed:
+                        continue
+                    try:
+                        await callback()
+                    except Exception as e:
+                        print(f"Generation listener error: {e}")
+
+
+content_generation = ContentGeneration(settings.INDEX_REBUILD_DEBOUNCE_MS)
+
+
+# Any committed ORM write to FAQ/Document rows bumps the generation
+@event.listens_for(Session, "after_flush")
+def _track_content_changes(session, flush_context):
+    scopes = _scopes_of((*session.new, *session.dirty, *session.deleted))
+    if scopes:
+        session.info.setdefault("content_changed", set()).update(scopes)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_content_changes(orm_execute_state):
+    if orm_execute_state.is_select:
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, CONTENT_MODELS):
+        scopes = {scope for model, scope in CONTENT_SCOPES if issubclass(mapper.class_, model)}
+        orm_execute_state.session.info.setdefault("content_changed", set()).update(scopes)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_after_commit(session):
+    scopes = session.info.pop("content_changed", None)
+    if not scopes:
+        return
+    try:
+        content_generation.spawn(content_generation.bump(scopes))
+    except RuntimeError:
+        # Sync sessions (admin endpoints, scripts) run without an event loop
+        try:
+            with redis.from_url(settings.REDIS_URL).pipeline(transaction=True) as pipe:
+                pipe.incr(GENERATION_KEY)
+                for scope in scopes:
+                    pipe.incr(SCOPE_KEYS[scope])
+                pipe.execute()
+        except Exception as e:
+            print(f"Generation bump error: {e}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_content_changes(session):
+    session.info.pop("content_changed", None)
@@ -1,20 +1,115 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
-import redis
+from app.core.metrics import Histogram, registry
+from app.core.redis_guard import create_guarded_redis
+from typing import Dict
+import time
+import redis.asyncio as aioredis
 
-# PostgreSQL
+def _async_database_url(url: str) -> str:
+    """Map a sync database URL onto its asyncio driver"""
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url
+
+# PostgreSQL (sync engine is kept for schema management and admin tooling)
 engine = create_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+pool_wait = registry.register(Histogram(
+    "campus_pool_wait_seconds",
+    "Time spent waiting for a pooled connection",
+    ("pool",)
+))
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_wait.observe(time.perf_counter() - start, "database")
+
+class TimedRedisPool(aioredis.BlockingConnectionPool):
+    """Bounded Redis pool: callers wait (up to a timeout) instead of opening more sockets"""
+
+    async def get_connection(self, command_name, *keys, **options):
+        start = time.perf_counter()
+        try:
+            return await super().get_connection(command_name, *keys, **options)
+        finally:
+            pool_wait.observe(time.perf_counter() - start, "redis")
+
+def _async_engine_options(url: str) -> Dict:
+    if url in ("sqlite://", "sqlite:///:memory:"):
+        # In-memory SQLite lives in one connection; pooling would lose it
+        return {}
+    return {
+        "poolclass": TimedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+
+# PostgreSQL (async engine used on the request path)
+async_engine = create_async_engine(
+    _async_database_url(settings.DATABASE_URL),
+    **_async_engine_options(settings.DATABASE_URL)
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 # Redis
-redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+redis_pool = TimedRedisPool.from_url(
+    settings.REDIS_URL,
+    decode_responses=True,
+    max_connections=settings.REDIS_MAX_CONNECTIONS,
+    timeout=settings.REDIS_POOL_TIMEOUT,
+    health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT
+)
+# Fails fast behind a circuit breaker when Redis is down; see redis_guard
+redis_client = create_guarded_redis(aioredis.Redis(connection_pool=redis_pool))
+
+def pool_stats() -> Dict:
+    """Occupancy of the database and Redis connection pools"""
+    pool = async_engine.pool
+    database = {"pool": type(pool).__name__}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        database.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": settings.DB_MAX_OVERFLOW
+        })
+    return {
+        "database": database,
+        "redis": {
+            "max_connections": redis_pool.max_connections,
+            "in_use": len(redis_pool._in_use_connections),
+            "idle": len(redis_pool._available_connections)
+        }
+    }
 
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,123 @@
+from typing import Dict, Hashable, List, Sequence, Tuple
+from collections import defaultdict
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+FAQ_LANGUAGES = ("en", "hi", "mr", "ta", "te")
+
+
+def _any_term_query(config: str, value: str = ":query") -> str:
+    # plainto_tsquery ANDs every term; a question rarely repeats all of them,
+    # so match any term and let ts_rank reward the rows that match more
+    return f"replace(plainto_tsquery('{config}', {value})::text, ' & ', ' | ')::tsquery"
+
+
+def _tsquery(language: str, value: str = ":query") -> str:
+    english = _any_term_query("english", value)
+    # Queries are usually English; the simple config also matches Indic question text
+    return english if language == "en" else f"{english} || {_any_term_query('simple', value)}"
+
+
+# Every query of a batch is ranked by one statement: unnest the texts and run
+# the per-query top-k as a LATERAL subquery
+BATCH = "unnest(CAST(:queries AS text[])) WITH ORDINALITY AS queries(query_text, n)"
+
+
+async def search_faqs_many(db: AsyncSession, queries: Sequence[Tuple[str, str]], top_k: int = 5) -> List[List[Tuple[int, float]]]:
+    """search_faqs() for many (query, language) pairs: at most two statements per distinct language
+
+    Identical pairs are ranked once.
+    """
+    keys = [(query, language if language in FAQ_LANGUAGES else "en") for query, language in queries]
+    texts_by_language: Dict[str, List[str]] = defaultdict(list)
+    for query, language in dict.fromkeys(keys):
+        texts_by_language[language].append(query)
+
+    ranked: Dict[Tuple[str, str], List[Tuple[int, float]]] = defaultdict(list)
+    for language, texts in texts_by_language.items():
+        rows = (await db.execute(text(f"""
+            SELECT queries.n, hit.id, hit.rank
+            FROM {BATCH}
+            CROSS JOIN LATERAL (
+                SELECT id, priority, ts_rank(search_{language}, q, 32) AS rank
+                FROM faqs, (SELECT {_tsquery(language, 'queries.query_text')} AS q) AS tsq
+                WHERE is_active AND search_{language} @@ q
+                ORDER BY rank DESC, priority DESC
+                LIMIT :top_k
+            ) AS hit
+            ORDER BY queries.n, hit.rank DESC, hit.priority DESC
+        """), {"queries": texts, "top_k": top_k})).all()
+        for n, faq_id, rank in rows:
+            ranked[(texts[n - 1], language)].append((faq_id, round(min(rank * settings.FTS_RANK_SCALE, 1.0), 4)))
+
+        # pg_trgm similarity for the texts no term matched (misspelled queries)
+        unmatched = [query for query in texts if (query, language) not in ranked]
+        if not unmatched:
+            continue
+        columns = ["question_en"] if language == "en" else [f"question_{language}", "question_en"]
+        rows = (await db.execute(text(f"""
+            SELECT queries.n, hit.id, hit.score
+            FROM {BATCH}
+            CROSS JOIN LATERAL (
+                SELECT id, priority, GREATEST({', '.join(f'similarity({column}, queries.query_text)' for column in columns)}) AS score
+                FROM faqs
+                WHERE is_active AND ({' OR '.join(f'{column} % queries.query_text' for column in columns)})
+                ORDER BY score DESC, priority DESC
+                LIMIT :top_k
+            ) AS hit
+            ORDER BY queries.n, hit.score DESC, hit.priority DESC
+        """), {"queries": unmatched, "top_k": top_k})).all()
+        for n, faq_id, score in rows:
+            ranked[(unmatched[n - 1], language)].append((faq_id, round(score, 4)))
+
+    return [ranked.get(key, []) for key in keys]
+
+
+async def search_faqs(db: AsyncSession, query: str, language: str = "en", top_k: int = 5) -> List[Tuple[int, float]]:
+    """(faq_id, confidence) from the search_<language> GIN index, best first
+
+    Falls back to pg_trgm similarity on the question columns when no term
+    matches, which catches misspelled queries.
+    """
+    return (await search_faqs_many(db, [(query, language)], top_k))[0]
+
+
+async def search_documents_many(db: AsyncSession, queries: Sequence[str], top_k: int = 3) -> List[List[Tuple[Tuple[Hashable, Hashable], float]]]:
+    """search_documents() for many queries in one statement; identical texts are ranked once"""
+    texts = list(dict.fromkeys(queries))
+    if not texts:
+        return []
+    tsquery = _tsquery("mixed", "queries.query_text")
+    rows = (await db.execute(text(f"""
+        SELECT queries.n, hit.document_id, hit.chunk_id, hit.rank
+        FROM {BATCH}
+        CROSS JOIN LATERAL (
+            SELECT c.document_id, c.id AS chunk_id, ts_rank(c.search_vector, q, 32) AS rank
+            FROM document_chunks c JOIN documents d ON d.id = c.document_id, (SELECT {tsquery} AS q) AS tsq
+            WHERE d.is_processed AND c.search_vector @@ q
+            UNION ALL
+            SELECT d.id, NULL, ts_rank(d.search_vector, q, 32)
+            FROM documents d, (SELECT {tsquery} AS q) AS tsq
+            WHERE d.is_processed AND d.search_vector @@ q
+              AND NOT EXISTS (SELECT 1 FROM document_chunks c WHERE c.document_id = d.id)
+            ORDER BY rank DESC
+            LIMIT :top_k
+        ) AS hit
+        ORDER BY queries.n, hit.rank DESC
+    """), {"queries": texts, "top_k": top_k})).all()
+    matches: Dict[str, List[Tuple[Tuple[Hashable, Hashable], float]]] = defaultdict(list)
+    for n, document_id, chunk_id, rank in rows:
+        matches[texts[n - 1]].append(((document_id, chunk_id), float(rank)))
+    return [matches.get(query, []) for query in queries]
+
+
+async def search_documents(db: AsyncSession, query: str, top_k: int = 3) -> List[Tuple[Tuple[Hashable, Hashable], float]]:
+    """((document_id, chunk_id), score) in the same shape as the vector index
+
+    Chunks are searched first-class; documents stored before chunking
+    (no chunk rows) are searched as a whole.
+    """
+    return (await search_documents_many(db, [query], top_k))[0]
@@ -0,0 +1,52 @@
+from typing import List, Optional
+import time
+
+from app.core.config import settings
+from app.core.metrics import stages_skipped
+
+
+class Deadline:
+    """Latency budget for one chat request, passed through NLU and retrieval
+
+    Stages ask whether enough budget is left before starting optional work
+    and record what they skipped, so a slow dependency degrades the answer
+    (untranslated passage, no L2, fallback) instead of stretching the request.
+    """
+
+    def __init__(self, budget: float, language: str = ""):
+        self.budget = budget
+        self.language = language
+        self.expires_at = time.monotonic() + budget
+        self.skipped: List[str] = []
+
+    @classmethod
+    def for_request(cls, language: str = "") -> "Deadline":
+        return cls(settings.REQUEST_BUDGET_MS / 1000, language)
+
+    def remaining(self) -> float:
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def allows(self, seconds: float) -> bool:
+        """Whether at least this much budget is left"""
+        return self.remaining() >= seconds
+
+    def timeout(self, cap: Optional[float] = None) -> float:
+        """Remaining budget, optionally capped by a per-call hard timeout"""
+        remaining = self.remaining()
+        return remaining if cap is None else min(remaining, cap)
+
+    def skip(self, stage: str):
+        self.skipped.append(stage)
+        stages_skipped.inc(stage, self.language)
+
+    @property
+    def degraded(self) -> bool:
+        return bool(self.skipped)
+
+    def skipped_stages(self) -> Optional[List[str]]:
+        """Distinct skipped stages in order, or None for a full-quality answer"""
+        return list(dict.fromkeys(self.skipped)) or None
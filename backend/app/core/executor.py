@@ -0,0 +1,42 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from app.core.config import settings
+
+# Bounded pool for blocking third-party calls (langdetect, index scoring) so
+# they never run on the event loop and cannot grow without limit under load.
+blocking_executor = ThreadPoolExecutor(
+    max_workers=settings.BLOCKING_EXECUTOR_WORKERS,
+    thread_name_prefix="blocking"
+)
+
+async def run_blocking(func: Callable, *args, **kwargs) -> Any:
+    """Run a blocking callable on the bounded executor and await its result"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(blocking_executor, functools.partial(func, *args, **kwargs))
+
+# googletrans calls are cut off by a timeout, but the thread keeps waiting on
+# Google; a separate pool keeps those stragglers from starving the one above
+translation_executor = ThreadPoolExecutor(
+    max_workers=settings.TRANSLATION_WORKERS,
+    thread_name_prefix="translate"
+)
+
+async def run_translation(func: Callable, *args) -> Any:
+    """Run a googletrans call on the translation executor and await its result"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(translation_executor, func, *args)
+
+# bcrypt is deliberately slow CPU work; its own small pool bounds how many
+# hashes run at once and keeps a burst of logins off the threads above
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="bcrypt"
+)
+
+async def run_password_hashing(func: Callable, *args) -> Any:
+    """Run a bcrypt hash or verify on the password executor and await its result"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, func, *args)
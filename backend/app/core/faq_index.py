@@ -0,0 +1,134 @@
+from typing import Dict, List, Tuple
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import FAQ
+from app.core.config import settings
+from app.core.text_normalization import normalize_text
+
+# \w does not match Indic vowel signs or virama, which would split words such as
+# "शुल्क" into fragments; include the Indic blocks explicitly (minus the dandas).
+TOKEN_PATTERN = re.compile(r"[\w\u0900-\u0963\u0966-\u0DFF]+")
+
+def tokenize(text: str) -> List[str]:
+    """Split canonicalized text into word tokens, keeping Indic syllables intact"""
+    if not text:
+        return []
+    return TOKEN_PATTERN.findall(normalize_text(text))
+
+
+class _LanguageIndex:
+    """Immutable BM25 postings for one language"""
+
+    def __init__(self, faq_ids: List[int], priorities: List[int], postings: Dict[str, List[Tuple[int, float]]], idf: Dict[str, float], unseen_idf: float):
+        self.faq_ids = faq_ids
+        self.priorities = priorities
+        self.postings = postings
+        self.idf = idf
+        self.unseen_idf = unseen_idf
+
+
+class FAQIndex:
+    """In-process BM25 inverted index over FAQ questions, keywords and category"""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._indexes: Dict[str, _LanguageIndex] = {}
+
+    @staticmethod
+    def _document_text(faq: FAQ, language: str) -> str:
+        parts = [faq.question_en or ""]
+        if language != "en":
+            parts.append(getattr(faq, f"question_{language}", None) or "")
+
+        keywords = faq.keywords or []
+        if isinstance(keywords, dict):
+            keywords = list(keywords.keys())
+        elif isinstance(keywords, str):
+            keywords = [keywords]
+        parts.extend(str(keyword) for keyword in keywords)
+
+        parts.append(faq.category or "")
+        return " ".join(parts)
+
+    def _build_language(self, faqs: List[FAQ], language: str) -> _LanguageIndex:
+        documents = [Counter(tokenize(self._document_text(faq, language))) for faq in faqs]
+        doc_lengths = [sum(counts.values()) for counts in documents]
+        total_docs = len(documents)
+        avg_length = (sum(doc_lengths) / total_docs) if total_docs else 0.0
+
+        doc_freq: Counter = Counter()
+        for counts in documents:
+            doc_freq.update(counts.keys())
+        idf = {
+            term: math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+            for term, df in doc_freq.items()
+        }
+
+        # Store the full BM25 term weight per posting so a query is just a sum
+        postings: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+        for doc_idx, counts in enumerate(documents):
+            norm = self.k1 * (1 - self.b + self.b * doc_lengths[doc_idx] / avg_length) if avg_length else self.k1
+            for term, tf in counts.items():
+                weight = idf[term] * tf * (self.k1 + 1) / (tf + norm)
+                postings[term].append((doc_idx, weight))
+
+        return _LanguageIndex(
+            faq_ids=[faq.id for faq in faqs],
+            priorities=[faq.priority or 0 for faq in faqs],
+            postings=dict(postings),
+            idf=idf,
+            unseen_idf=math.log(1 + (total_docs + 0.5) / 0.5)
+        )
+
+    def build(self, faqs: List[FAQ]) -> Dict:
+        """Rebuild every language index from the given FAQ rows"""
+        indexes = {language: self._build_language(faqs, language) for language in settings.SUPPORTED_LANGUAGES}
+        # Swap in one assignment so concurrent searches never see a partial index
+        self._indexes = indexes
+        return {
+            "faqs": len(faqs),
+            "terms": {language: len(index.postings) for language, index in indexes.items()}
+        }
+
+    def search(self, query: str, language: str = "en", top_k: int = 5) -> List[Tuple[int, float]]:
+        """Return up to top_k (faq_id, confidence) pairs ranked by BM25 score"""
+        index = self._indexes.get(language) or self._indexes.get("en")
+        if index is None:
+            return []
+
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+
+        scores: Dict[int, float] = defaultdict(float)
+        for term in terms:
+            for doc_idx, weight in index.postings.get(term, ()):
+                scores[doc_idx] += weight
+        if not scores:
+            return []
+
+        # A term matched once in an average-length question contributes its idf,
+        # so the summed query idf turns the raw score into a 0-1 confidence.
+        ideal = sum(index.idf.get(term, index.unseen_idf) for term in terms)
+        best = heapq.nlargest(
+            top_k,
+            scores.items(),
+            key=lambda item: (item[1], index.priorities[item[0]])
+        )
+        return [(index.faq_ids[doc_idx], round(min(score / ideal, 1.0), 4)) for doc_idx, score in best]
+
+
+async def load_faq_index(db: AsyncSession) -> Dict:
+    """Build the shared FAQ index from all active FAQ rows"""
+    result = await db.execute(select(FAQ).where(FAQ.is_active == True))
+    return faq_index.build(result.scalars().all())
+
+
+faq_index = FAQIndex()
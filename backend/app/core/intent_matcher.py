@@ -0,0 +1,200 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+import re
+from collections import deque
+
+# Characters that make a pattern more than a plain "(a|b|c)" keyword alternation
+REGEX_META = re.compile(r"[.^$*+?{}\[\]\\()]")
+
+
+def parse_alternation(pattern: str) -> Optional[List[str]]:
+    """Return the literal alternatives of a "(a|b|c)" pattern, or None if it is a real regex"""
+    if pattern.startswith("(") and pattern.endswith(")"):
+        pattern = pattern[1:-1]
+    alternatives = pattern.split("|")
+    if any(not alternative or REGEX_META.search(alternative) for alternative in alternatives):
+        return None
+    return alternatives
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton reporting every keyword occurrence in one pass"""
+
+    def __init__(self, keywords: List[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        self._lengths = [len(keyword) for keyword in keywords]
+
+        for keyword_id, keyword in enumerate(keywords):
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(keyword_id)
+
+        # Breadth-first failure links; outputs inherit their fallback state's outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield (start, keyword_id) for every occurrence, overlapping ones included"""
+        goto, fail, output, lengths = self._goto, self._fail, self._output, self._lengths
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for keyword_id in output[state]:
+                yield index - lengths[keyword_id] + 1, keyword_id
+
+
+class _LanguageMatcher:
+    """All intent and entity patterns of one language compiled into one automaton"""
+
+    def __init__(self, patterns: List[Tuple[str, str]]):
+        # patterns: (owner, regex) in scoring order; owner is an intent or "entity:<name>"
+        self.owners = [owner for owner, _ in patterns]
+        self.regexes: Dict[int, re.Pattern] = {}
+        self.alternatives: Dict[int, List[str]] = {}
+
+        keyword_ids: Dict[str, int] = {}
+        self.keyword_targets: List[List[Tuple[int, int]]] = []
+        for pattern_id, (_, pattern) in enumerate(patterns):
+            alternatives = parse_alternation(pattern)
+            if alternatives is None:
+                self.regexes[pattern_id] = re.compile(pattern, re.IGNORECASE)
+                continue
+            alternatives = [alternative.lower() for alternative in alternatives]
+            self.alternatives[pattern_id] = alternatives
+            for alt_index, keyword in enumerate(alternatives):
+                if keyword not in keyword_ids:
+                    keyword_ids[keyword] = len(self.keyword_targets)
+                    self.keyword_targets.append([])
+                self.keyword_targets[keyword_ids[keyword]].append((pattern_id, alt_index))
+
+        self.automaton = KeywordAutomaton(list(keyword_ids))
+
+    def scan(self, text_lower: str) -> Dict[int, Dict[int, int]]:
+        """Map pattern_id -> {start: first alternative matching there}"""
+        hits: Dict[int, Dict[int, int]] = {}
+        for start, keyword_id in self.automaton.iter_matches(text_lower):
+            for pattern_id, alt_index in self.keyword_targets[keyword_id]:
+                starts = hits.setdefault(pattern_id, {})
+                if alt_index < starts.get(start, alt_index + 1):
+                    starts[start] = alt_index
+        return hits
+
+    def count(self, pattern_id: int, starts: Dict[int, int]) -> int:
+        """Count non-overlapping matches exactly as re.findall would"""
+        alternatives = self.alternatives[pattern_id]
+        position = 0
+        matches = 0
+        for start in sorted(starts):
+            if start >= position:
+                matches += 1
+                position = start + len(alternatives[starts[start]])
+        return matches
+
+
+class IntentMatcher:
+    """Single-pass intent scoring and entity extraction over precompiled keyword tables"""
+
+    def __init__(self, intent_patterns: Dict[str, Dict[str, List[str]]], entity_patterns: Dict[str, Dict[str, Dict[str, List[str]]]]):
+        self.entity_patterns = entity_patterns
+        languages = {language for table in intent_patterns.values() for language in table}
+        languages |= {
+            language
+            for entities in entity_patterns.values()
+            for table in entities.values()
+            for language in table
+        }
+        self._matchers = {
+            language: self._compile(intent_patterns, entity_patterns, language)
+            for language in languages
+        }
+        self._default = self._matchers.get("en") or self._compile(intent_patterns, entity_patterns, "en")
+
+    @staticmethod
+    def _compile(intent_patterns, entity_patterns, language: str) -> _LanguageMatcher:
+        patterns = []
+        for intent, lang_patterns in intent_patterns.items():
+            for pattern in lang_patterns.get(language, lang_patterns.get("en", [])):
+                patterns.append((intent, pattern))
+        for entities in entity_patterns.values():
+            for entity, lang_patterns in entities.items():
+                for pattern in lang_patterns.get(language, lang_patterns.get("en", [])):
+                    patterns.append((f"entity:{entity}", pattern))
+        return _LanguageMatcher(patterns)
+
+    def match(self, text: str, language: str = "en") -> Tuple[str, float, Dict]:
+        """Return (intent, confidence, entities) from one scan of the text"""
+        matcher = self._matchers.get(language, self._default)
+        text_lower = text.lower()
+        hits = matcher.scan(text_lower)
+
+        counts: Dict[int, int] = {}
+        for pattern_id, starts in hits.items():
+            if not matcher.owners[pattern_id].startswith("entity:"):
+                counts[pattern_id] = matcher.count(pattern_id, starts)
+        # Patterns that are real regexes cannot go through the automaton
+        for pattern_id, regex in matcher.regexes.items():
+            if not matcher.owners[pattern_id].startswith("entity:"):
+                matches = len(regex.findall(text_lower))
+                if matches:
+                    counts[pattern_id] = matches
+
+        # Same order and comparison as the original per-pattern loop
+        best_intent = "general"
+        best_confidence = 0.0
+        for pattern_id in sorted(counts):
+            confidence = counts[pattern_id] * 0.3 + 0.4  # Base confidence
+            if confidence > best_confidence:
+                best_intent = matcher.owners[pattern_id]
+                best_confidence = min(confidence, 0.95)
+
+        entities = self._entities(matcher, hits, text, text_lower, best_intent)
+        return best_intent, best_confidence, entities
+
+    def entities(self, text: str, intent: str, language: str = "en") -> Dict:
+        """Extract the entities defined for an intent"""
+        matcher = self._matchers.get(language, self._default)
+        text_lower = text.lower()
+        return self._entities(matcher, matcher.scan(text_lower), text, text_lower, intent)
+
+    def _entities(self, matcher: _LanguageMatcher, hits: Dict[int, Dict[int, int]], text: str, text_lower: str, intent: str) -> Dict:
+        entities = {}
+        # Offsets in the lowered text only map back when lowering kept the length
+        same_offsets = len(text_lower) == len(text)
+        for entity in self.entity_patterns.get(intent, {}):
+            owner = f"entity:{entity}"
+            for pattern_id, pattern_owner in enumerate(matcher.owners):
+                if pattern_owner != owner:
+                    continue
+                if pattern_id in matcher.regexes or not same_offsets:
+                    regex = matcher.regexes.get(pattern_id) or re.compile(f"({'|'.join(map(re.escape, matcher.alternatives[pattern_id]))})", re.IGNORECASE)
+                    match = regex.search(text)
+                    value = match.group(1) if match else None
+                elif pattern_id in hits:
+                    # re.search semantics: leftmost start, then first listed alternative
+                    start = min(hits[pattern_id])
+                    value = text[start:start + len(matcher.alternatives[pattern_id][hits[pattern_id][start]])]
+                else:
+                    value = None
+                if value:
+                    entities[entity] = value
+                    break
+        return entities
@@ -0,0 +1,196 @@
+from typing import Dict, List, Optional, Tuple
+import math
+from collections import Counter
+
+from app.core.executor import run_blocking
+from app.core.metrics import stage_timer
+
+# Unicode blocks -> script name (start, end inclusive)
+SCRIPT_RANGES = [
+    (0x0041, 0x005A, "latin"),
+    (0x0061, 0x007A, "latin"),
+    (0x00C0, 0x024F, "latin"),
+    (0x0600, 0x06FF, "arabic"),
+    (0x0900, 0x097F, "devanagari"),
+    (0x0980, 0x09FF, "bengali"),
+    (0x0A00, 0x0A7F, "gurmukhi"),
+    (0x0A80, 0x0AFF, "gujarati"),
+    (0x0B00, 0x0B7F, "oriya"),
+    (0x0B80, 0x0BFF, "tamil"),
+    (0x0C00, 0x0C7F, "telugu"),
+    (0x0C80, 0x0CFF, "kannada"),
+    (0x0D00, 0x0D7F, "malayalam"),
+]
+# Character -> script lookup table, so the histogram is one dict probe per char
+SCRIPT_OF = {
+    chr(code): script
+    for start, end, script in SCRIPT_RANGES
+    for code in range(start, end + 1)
+}
+
+# Same mapping the langdetect path used: other Indian scripts fall back to Hindi
+SCRIPT_LANGUAGES = {
+    "tamil": "ta", "telugu": "te",
+    "bengali": "hi", "gurmukhi": "hi", "gujarati": "hi", "oriya": "hi",
+    "kannada": "hi", "malayalam": "hi", "arabic": "hi",
+}
+
+LANGDETECT_MAPPING = {
+    'hi': 'hi', 'mr': 'mr', 'ta': 'ta', 'te': 'te',
+    'bn': 'hi', 'gu': 'hi', 'kn': 'hi', 'ml': 'hi',
+    'pa': 'hi', 'or': 'hi', 'as': 'hi', 'ur': 'hi'
+}
+
+# Seed text for the Hindi/Marathi character trigram model. Both languages share
+# Devanagari, so they are told apart by function words and endings (है/आहे,
+# का/चा, में/मध्ये, नहीं/नाही, ळ).
+SEED_CORPUS = {
+    "hi": [
+        "मुझे फीस के बारे में जानकारी चाहिए",
+        "परीक्षा का परिणाम कब आएगा",
+        "छात्रावास में कमरा कैसे मिलेगा",
+        "क्या मैं किस्तों में फीस दे सकता हूं",
+        "पुस्तकालय का समय क्या है",
+        "प्रवेश प्रक्रिया क्या है और कौन से दस्तावेज चाहिए",
+        "छात्रवृत्ति के लिए आवेदन कब खुलते हैं",
+        "आप मेरी मदद कर सकते हैं",
+        "मैं अपना परिणाम कहां देख सकता हूं",
+        "यह जानकारी मुझे नहीं मिली है",
+        "कक्षा का समय सारणी कहां से डाउनलोड करें",
+        "हमें कॉलेज के बारे में और बताइए",
+        "फीस की अंतिम तारीख कब है",
+        "मेरा नाम राहुल है और मैं पहले वर्ष में हूं",
+    ],
+    "mr": [
+        "मला शुल्काबद्दल माहिती हवी आहे",
+        "परीक्षेचा निकाल केव्हा लागेल",
+        "वसतिगृहात खोली कशी मिळेल",
+        "मी हप्त्यांमध्ये शुल्क भरू शकतो का",
+        "वाचनालयाची वेळ काय आहे",
+        "प्रवेश प्रक्रिया काय आहे आणि कोणती कागदपत्रे लागतात",
+        "शिष्यवृत्तीसाठी अर्ज केव्हा सुरू होतात",
+        "तुम्ही मला मदत करू शकता का",
+        "मी माझा निकाल कुठे पाहू शकतो",
+        "ही माहिती मला मिळाली नाही",
+        "वर्गाचे वेळापत्रक कुठून डाउनलोड करायचे",
+        "आम्हाला महाविद्यालयाबद्दल अधिक सांगा",
+        "शुल्क भरण्याची शेवटची तारीख कधी आहे",
+        "माझे नाव राहुल आहे आणि मी पहिल्या वर्षात आहे",
+    ],
+}
+
+
+class NgramModel:
+    """Add-one smoothed character trigram classifier"""
+
+    def __init__(self, corpus: Dict[str, List[str]], n: int = 3):
+        self.n = n
+        self.log_probs: Dict[str, Dict[str, float]] = {}
+        self.unseen: Dict[str, float] = {}
+        counts = {language: Counter(gram for text in texts for gram in self._grams(text)) for language, texts in corpus.items()}
+        vocabulary = len(set().union(*counts.values()))
+        for language, grams in counts.items():
+            total = sum(grams.values()) + vocabulary
+            self.log_probs[language] = {gram: math.log((count + 1) / total) for gram, count in grams.items()}
+            self.unseen[language] = math.log(1 / total)
+
+    def _grams(self, text: str) -> List[str]:
+        grams = []
+        for word in text.split():
+            padded = f" {word} "
+            grams.extend(padded[i:i + self.n] for i in range(len(padded) - self.n + 1))
+        return grams
+
+    def classify(self, text: str) -> Tuple[str, float]:
+        """Return (best language, per-gram log-likelihood margin over the runner-up)"""
+        grams = self._grams(text)
+        if not grams:
+            return next(iter(self.log_probs)), 0.0
+        scores = {
+            language: sum(table.get(gram, self.unseen[language]) for gram in grams)
+            for language, table in self.log_probs.items()
+        }
+        ranked = sorted(scores, key=scores.get, reverse=True)
+        margin = (scores[ranked[0]] - scores[ranked[1]]) / len(grams) if len(ranked) > 1 else float("inf")
+        return ranked[0], margin
+
+
+class LanguageDetector:
+    """Deterministic tiered detection: script histogram, then n-grams, then langdetect"""
+
+    TIERS = ("script", "ngram", "langdetect", "default")
+
+    def __init__(self, indic_share: float = 0.3, min_margin: float = 0.05):
+        self.indic_share = indic_share
+        self.min_margin = min_margin
+        self.devanagari_model = NgramModel(SEED_CORPUS)
+        self._hits = Counter()
+
+    def _record(self, tier: str, language: str) -> str:
+        self._hits[tier] += 1
+        return language
+
+    def _langdetect(self, text: str) -> Optional[str]:
+        try:
+            from langdetect import DetectorFactory, detect
+
+            DetectorFactory.seed = 0  # langdetect is random without a fixed seed
+            with stage_timer("langdetect"):
+                return LANGDETECT_MAPPING.get(detect(text))
+        except Exception:
+            return None
+
+    def _classify(self, text: str) -> Tuple[str, bool]:
+        """(language, ambiguous); an ambiguous Hindi/Marathi guess still wants langdetect"""
+        if text.isascii():
+            # Fast path for the bulk of traffic: plain English
+            return self._record("script" if any(char.isalpha() for char in text) else "default", "en"), False
+
+        histogram = Counter(map(SCRIPT_OF.get, text))
+        histogram.pop(None, None)
+        letters = sum(histogram.values())
+        if not letters:
+            return self._record("default", "en"), False
+
+        indic = {script: count for script, count in histogram.items() if script != "latin"}
+        if not indic or sum(indic.values()) / letters < self.indic_share:
+            # Every non-Indic langdetect result used to map to English anyway
+            return self._record("script", "en"), False
+
+        script = max(indic, key=indic.get)
+        if script != "devanagari":
+            return self._record("script", SCRIPT_LANGUAGES[script]), False
+
+        # Devanagari is shared by Hindi and Marathi
+        devanagari_text = "".join(char if SCRIPT_OF.get(char) == "devanagari" else " " for char in text)
+        language, margin = self.devanagari_model.classify(devanagari_text)
+        if margin >= self.min_margin:
+            return self._record("ngram", language), False
+        return language, True
+
+    def _resolve(self, guess: str, detected: Optional[str]) -> str:
+        if detected in ("hi", "mr"):
+            return self._record("langdetect", detected)
+        return self._record("ngram", guess)
+
+    def detect(self, text: str) -> str:
+        """Detect the language of a chat message"""
+        language, ambiguous = self._classify(text)
+        if not ambiguous:
+            return language
+        return self._resolve(language, self._langdetect(text))
+
+    async def detect_async(self, text: str) -> str:
+        """detect() for the request path: the langdetect fallback runs on the blocking executor"""
+        language, ambiguous = self._classify(text)
+        if not ambiguous:
+            return language
+        return self._resolve(language, await run_blocking(self._langdetect, text))
+
+    def stats(self) -> Dict:
+        total = sum(self._hits.values())
+        return {
+            "total": total,
+            "tiers": {tier: self._hits[tier] for tier in self.TIERS},
+            "hit_rates": {tier: round(self._hits[tier] / total, 4) if total else 0.0 for tier in self.TIERS}
+        }
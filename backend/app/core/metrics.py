@@ -0,0 +1,127 @@
+from typing import Callable, Dict, List, Sequence, Tuple
+from bisect import bisect_left
+from contextlib import contextmanager
+import time
+
+# Seconds; spans sub-millisecond cache hits up to slow googletrans calls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram rendered in Prometheus text format"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str], buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # label values -> [count per bucket (+Inf last), sum]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *labelvalues: str):
+        series = self._series.get(labelvalues)
+        if series is None:
+            series = self._series[labelvalues] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    @contextmanager
+    def time(self, *labelvalues: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labelvalues)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labelvalues, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), series):
+                cumulative += count
+                le = 'le="+Inf"' if bound == "+Inf" else f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labelvalues, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labelvalues)} {series[-1]}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labelvalues)} {cumulative}")
+        return lines
+
+
+class Counter:
+    """Monotonic per-label-set counter rendered in Prometheus text format"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1):
+        self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for labelvalues, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, labelvalues)} {value}")
+        return lines
+
+
+class Gauge:
+    """Value read from a callback at scrape time"""
+
+    def __init__(self, name: str, documentation: str, read: Callable[[], float]):
+        self.name = name
+        self.documentation = documentation
+        self.read = read
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge", f"{self.name} {self.read()}"]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+stage_latency = registry.register(Histogram(
+    "campus_stage_duration_seconds",
+    "Time spent in each chat pipeline stage",
+    ("stage", "language")
+))
+response_latency = registry.register(Histogram(
+    "campus_chat_response_duration_seconds",
+    "End-to-end chat response time",
+    ("endpoint", "language", "source")
+))
+stages_skipped = registry.register(Counter(
+    "campus_stage_skipped_total",
+    "Pipeline stages skipped or cut short to stay within the request budget",
+    ("stage", "language")
+))
+
+
+def stage_timer(stage: str, language: str = ""):
+    """Context manager timing one pipeline stage"""
+    return stage_latency.time(stage, language or "")
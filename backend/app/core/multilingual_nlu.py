@@ -1,12 +1,17 @@
 from typing import Dict, List, Tuple, Optional
-import re
-from langdetect import detect
-import json
-from googletrans import Translator
+import asyncio
+import time
+
+from app.core.deadline import Deadline
+from app.core.intent_matcher import IntentMatcher
+from app.core.language_detection import LanguageDetector
+from app.core.metrics import stage_latency, stage_timer
+from app.core.translation import translation_service
 
 class MultilingualNLU:
     def __init__(self):
-        self.translator = Translator()
+        self.translation_service = translation_service
+        self.language_detector = LanguageDetector()
         
         # Enhanced intent patterns for multiple languages
         self.intent_patterns = {
@@ -68,113 +73,107 @@ class MultilingualNLU:
             }
         }
         
-    def detect_language(self, text: str) -> str:
-        """Enhanced language detection"""
-        try:
-            lang = detect(text)
-            # Map various Indian language codes to supported ones
-            lang_mapping = {
-                'hi': 'hi', 'mr': 'mr', 'ta': 'ta', 'te': 'te',
-                'bn': 'hi', 'gu': 'hi', 'kn': 'hi', 'ml': 'hi',
-                'pa': 'hi', 'or': 'hi', 'as': 'hi', 'ur': 'hi'
+        # Entity patterns per intent: extract academic year, semester, course for fees
+        self.entity_patterns = {
+            "fees": {
+                "academic_year": {
+                    'en': [r'(20\d{2})', r'(first|second|third|fourth)', r'(1st|2nd|3rd|4th)'],
+                    'hi': [r'(पहला|दूसरा|तीसरा|चौथा)', r'(प्रथम|द्वितीय|तृतीय|चतुर्थ)'],
+                    'mr': [r'(पहिला|दुसरा|तिसरा|चौथा)', r'(प्रथम|द्वितीय|तृतीय|चतुर्थ)']
+                }
+            },
+            "exam": {
+                "exam_type": {
+                    'en': [r'(mid|final|internal|external|practical|theory)'],
+                    'hi': [r'(मध्यावधि|अंतिम|आंतरिक|बाहरी|प्रैक्टिकल|सिद्धांत)'],
+                    'mr': [r'(मध्यावधी|अंतिम|अंतर्गत|बाह्य|प्रात्यक्षिक|सिद्धांत)']
+                }
             }
-            return lang_mapping.get(lang, 'en')
-        except:
-            # Fallback: detect based on script
-            if any('\u0900' <= char <= '\u097F' for char in text):  # Devanagari
-                return 'hi'
-            elif any('\u0B80' <= char <= '\u0BFF' for char in text):  # Tamil
-                return 'ta'
-            elif any('\u0C00' <= char <= '\u0C7F' for char in text):  # Telugu
-                return 'te'
-            return 'en'
+        }
+        
+        # Compile every table once into one keyword automaton per language
+        self.matcher = IntentMatcher(self.intent_patterns, self.entity_patterns)
+        
+    async def detect_language(self, text: str) -> str:
+        """Enhanced language detection"""
+        return await self.language_detector.detect_async(text)
     
     def extract_intent(self, text: str, language: str = 'en') -> Tuple[str, float]:
         """Extract intent with multilingual support"""
-        text_lower = text.lower()
-        best_intent = "general"
-        best_confidence = 0.0
-        
-        for intent, lang_patterns in self.intent_patterns.items():
-            patterns = lang_patterns.get(language, lang_patterns.get('en', []))
-            for pattern in patterns:
-                matches = re.findall(pattern, text_lower, re.IGNORECASE)
-                if matches:
-                    confidence = len(matches) * 0.3 + 0.4  # Base confidence
-                    if confidence > best_confidence:
-                        best_intent = intent
-                        best_confidence = min(confidence, 0.95)
-        
-        return best_intent, best_confidence
+        intent, confidence, _ = self.matcher.match(text, language)
+        return intent, confidence
     
     def extract_entities(self, text: str, intent: str, language: str = 'en') -> Dict:
         """Extract entities based on intent and language"""
-        entities = {}
-        
-        if intent == "fees":
-            # Extract academic year, semester, course
-            year_patterns = {
-                'en': [r'(20\d{2})', r'(first|second|third|fourth)', r'(1st|2nd|3rd|4th)'],
-                'hi': [r'(पहला|दूसरा|तीसरा|चौथा)', r'(प्रथम|द्वितीय|तृतीय|चतुर्थ)'],
-                'mr': [r'(पहिला|दुसरा|तिसरा|चौथा)', r'(प्रथम|द्वितीय|तृतीय|चतुर्थ)']
-            }
-            
-            patterns = year_patterns.get(language, year_patterns['en'])
-            for pattern in patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    entities['academic_year'] = match.group(1)
-                    break
-                    
-        elif intent == "exam":
-            exam_patterns = {
-                'en': [r'(mid|final|internal|external|practical|theory)'],
-                'hi': [r'(मध्यावधि|अंतिम|आंतरिक|बाहरी|प्रैक्टिकल|सिद्धांत)'],
-                'mr': [r'(मध्यावधी|अंतिम|अंतर्गत|बाह्य|प्रात्यक्षिक|सिद्धांत)']
-            }
-            
-            patterns = exam_patterns.get(language, exam_patterns['en'])
-            for pattern in patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    entities['exam_type'] = match.group(1)
-                    break
-        
-        return entities
+        return self.matcher.entities(text, intent, language)
     
-    def translate_text(self, text: str, target_lang: str) -> str:
+    async def translate_text(self, text: str, target_lang: str, source_lang: Optional[str] = None,
+                             deadline: Optional[Deadline] = None, stage: str = "translation") -> str:
         """Translate text to target language"""
-        try:
-            if target_lang == 'en':
-                return text
-            
-            # Map our language codes to Google Translate codes
-            lang_map = {'hi': 'hi', 'mr': 'mr', 'ta': 'ta', 'te': 'te'}
-            target = lang_map.get(target_lang, 'en')
-            
-            result = self.translator.translate(text, dest=target)
-            return result.text
-        except Exception as e:
-            print(f"Translation error: {e}")
-            return text
+        return await self.translation_service.translate(text, target_lang, source_lang, deadline, stage)
     
-    def process_query(self, text: str, preferred_language: str = None) -> Dict:
-        """Complete multilingual NLU processing pipeline"""
-        detected_language = self.detect_language(text)
+    async def analyze(self, text: str, preferred_language: str = None) -> Dict:
+        """Language, intent and entities without the translation step"""
+        # Script/n-gram detection runs inline; langdetect, only needed for the
+        # rare ambiguous Hindi/Marathi message, goes to the blocking executor
+        start = time.perf_counter()
+        detected_language = await self.detect_language(text)
+        stage_latency.observe(time.perf_counter() - start, "language_detection", detected_language)
         language = preferred_language or detected_language
         
-        intent, confidence = self.extract_intent(text, language)
-        entities = self.extract_entities(text, intent, language)
-        
-        # Translate to English for backend processing if needed
-        text_en = text if language == 'en' else self.translate_text(text, 'en')
+        # One scan of the text yields the intent scores and the entities together
+        with stage_timer("intent_matching", language):
+            intent, confidence, entities = self.matcher.match(text, language)
         
         return {
             "original_text": text,
-            "text_en": text_en,
+            "text_en": text if language == 'en' else None,
             "detected_language": detected_language,
             "language": language,
             "intent": intent,
             "confidence": confidence,
             "entities": entities
-        }
\ No newline at end of file
+        }
+    
+    async def to_english(self, nlu_result: Dict, deadline: Optional[Deadline] = None) -> str:
+        """Translate an analyzed query to English for backend processing
+
+        Out of budget, the original text is searched as-is.
+        """
+        if nlu_result["text_en"] is None:
+            with stage_timer("translation", nlu_result["language"]):
+                nlu_result["text_en"] = await self.translate_text(
+                    nlu_result["original_text"], 'en', nlu_result["language"], deadline, "query_translation"
+                )
+        return nlu_result["text_en"]
+    
+    async def process_query(self, text: str, preferred_language: str = None) -> Dict:
+        """Complete multilingual NLU processing pipeline"""
+        nlu_result = await self.analyze(text, preferred_language)
+        
+        # Translate to English for backend processing if needed
+        await self.to_english(nlu_result)
+        
+        return nlu_result
+    
+    async def analyze_batch(self, texts: List[str], preferred_languages: List[Optional[str]]) -> List[Dict]:
+        """analyze() for many messages; repeated messages are analyzed once"""
+        analyzed = {}
+        for key in zip(texts, preferred_languages):
+            if key not in analyzed:
+                analyzed[key] = await self.analyze(*key)
+        return [dict(analyzed[key]) for key in zip(texts, preferred_languages)]
+    
+    async def to_english_batch(self, nlu_results: List[Dict], deadline: Optional[Deadline] = None):
+        """to_english() for many analyzed messages, translating each distinct text once, concurrently"""
+        pending = {}
+        for nlu_result in nlu_results:
+            if nlu_result["text_en"] is None:
+                pending.setdefault((nlu_result["original_text"], nlu_result["language"]), []).append(nlu_result)
+        
+        translations = await asyncio.gather(*(
+            self.translate_text(text, 'en', language, deadline, "query_translation") for text, language in pending
+        ))
+        for results, translated in zip(pending.values(), translations):
+            for nlu_result in results:
+                nlu_result["text_en"] = translated
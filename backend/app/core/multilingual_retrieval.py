@@ -1,43 +1,86 @@
 from typing import List, Dict, Optional, Tuple
+from collections import Counter
+import asyncio
 import json
-import numpy as np
-from sqlalchemy.orm import Session
-from sqlalchemy import func, or_, text
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 import hashlib
-from googletrans import Translator
 
-from app.models.models import FAQ, Document
+from app.models.models import FAQ, Document, DocumentChunk
 from app.core.database import redis_client
 from app.core.config import settings
+from app.core.content_generation import content_generation
+from app.core.db_search import search_documents_many, search_faqs_many
+from app.core.deadline import Deadline
+from app.core.executor import run_blocking
+from app.core.metrics import stage_timer
+from app.core.translation import translation_service
+from app.core.faq_index import faq_index
+from app.core.text_normalization import canonical_query
+from app.core.vector_index import document_index
 
 class MultilingualRetrievalPipeline:
-    def __init__(self, db: Session):
-        self.db = db
+    # Process-wide hit/miss counters for the Redis query cache
+    cache_stats = Counter()
+    
+    def __init__(self):
         self.redis_client = redis_client
-        self.translator = Translator()
+        self.translation_service = translation_service
         
-    def _get_cache_key(self, query: str, language: str = "en") -> str:
-        """Generate cache key for query"""
-        content = f"{query}:{language}"
+    def _get_cache_key(self, query: str, language: str = "en", tier: str = "faq") -> str:
+        """Generate cache key for the canonical form of a query"""
+        # The query is the English form; the user's language only picks the
+        # answer translation. Keyed on the content generation so FAQ/Document
+        # edits orphan old entries
+        content = f"{tier}:{canonical_query(query, 'en')}:{language}:{content_generation.current}"
         return f"query:{hashlib.md5(content.encode()).hexdigest()}"
     
-    def _cache_response(self, key: str, response: Dict, ttl: int = 3600):
+    async def _cache_response(self, key: str, response: Dict, ttl: int = 3600):
         """Cache response for quick retrieval"""
         try:
-            self.redis_client.setex(key, ttl, json.dumps(response, ensure_ascii=False))
+            await self.redis_client.setex(key, ttl, json.dumps(response, ensure_ascii=False))
         except Exception as e:
             print(f"Cache error: {e}")
     
-    def _get_cached_response(self, key: str) -> Optional[Dict]:
+    async def _get_cached_response(self, key: str) -> Optional[Dict]:
         """Get cached response"""
         try:
-            cached = self.redis_client.get(key)
+            with stage_timer("query_cache"):
+                cached = await self.redis_client.get(key)
             if cached:
+                self.cache_stats["hits"] += 1
                 return json.loads(cached)
+            self.cache_stats["misses"] += 1
         except Exception as e:
             print(f"Cache retrieval error: {e}")
         return None
     
+    async def _get_cached_many(self, keys: List[str]) -> List[Optional[Dict]]:
+        """Look up many cache keys in one round trip"""
+        if not keys:
+            return []
+        try:
+            values = await self.redis_client.mget(keys)
+        except Exception as e:
+            print(f"Cache retrieval error: {e}")
+            return [None] * len(keys)
+        hits = sum(value is not None for value in values)
+        self.cache_stats["hits"] += hits
+        self.cache_stats["misses"] += len(keys) - hits
+        return [json.loads(value) if value else None for value in values]
+    
+    async def _cache_many(self, entries: Dict[str, Dict], ttl: int = 3600):
+        """Cache many responses in one pipelined round trip"""
+        if not entries:
+            return
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for key, response in entries.items():
+                    pipe.setex(key, ttl, json.dumps(response, ensure_ascii=False))
+                await pipe.execute()
+        except Exception as e:
+            print(f"Cache error: {e}")
+    
     def _get_language_column(self, language: str, question: bool = True) -> str:
         """Get appropriate database column for language"""
         if question:
@@ -57,102 +100,108 @@ class MultilingualRetrievalPipeline:
                 'te': 'answer_te'
             }.get(language, 'answer_en')
     
-    def l1_faq_search(self, query: str, intent: str, language: str = "en") -> Optional[Dict]:
+    def _faq_response(self, faq: FAQ, confidence: float, language: str) -> Dict:
+        # Get answer in requested language, fallback to English
+        answer = getattr(faq, self._get_language_column(language, False)) or faq.answer_en
+        question = getattr(faq, self._get_language_column(language, True)) or faq.question_en
+        
+        return {
+            "source": "faq",
+            "confidence": confidence,
+            "answer": answer,
+            "question": question,
+            "category": faq.category,
+            "faq_id": faq.id,
+            "language": language
+        }
+    
+    async def _rank_faqs(self, db: AsyncSession, query: str, language: str) -> List[Tuple[int, float]]:
+        """Best FAQ ids for a query from the configured retrieval backend"""
+        return (await self._rank_faqs_many(db, [(query, language)]))[0]
+    
+    async def _rank_faqs_many(self, db: AsyncSession, queries: List[Tuple[str, str]]) -> List[List[Tuple[int, float]]]:
+        """_rank_faqs() for many (query, language) pairs; Postgres ranks them in one statement per language"""
+        if settings.RETRIEVAL_BACKEND == "postgres":
+            return await search_faqs_many(db, queries, top_k=5)
+        return [faq_index.search(query, language, top_k=5) for query, language in queries]
+    
+    async def _match_documents(self, db: AsyncSession, texts: List[str]) -> List[List[Tuple[Tuple, float]]]:
+        """Best (document_id, chunk_id) matches per text from the configured retrieval backend"""
+        if settings.RETRIEVAL_BACKEND == "postgres":
+            return await search_documents_many(db, texts, top_k=3)
+        # Score the whole corpus with one matrix product, off the event loop
+        return await run_blocking(document_index.search_texts, texts, 3)
+    
+    async def l1_faq_search(self, db: AsyncSession, query: str, intent: str, language: str = "en") -> Optional[Dict]:
         """Level 1: Search curated FAQs with multilingual support"""
-        cache_key = self._get_cache_key(f"faq:{query}", language)
-        cached = self._get_cached_response(cache_key)
+        cache_key = self._get_cache_key(query, language, "faq")
+        cached = await self._get_cached_response(cache_key)
         if cached:
             return cached
         
-        query_lower = query.lower()
-        
-        # Get appropriate language columns
-        question_col = self._get_language_column(language, True)
-        answer_col = self._get_language_column(language, False)
-        
-        # Build multilingual search query
-        search_conditions = [
-            func.lower(getattr(FAQ, question_col)).contains(query_lower),
-            func.lower(FAQ.question_en).contains(query_lower)  # Always search English as fallback
-        ]
-        
-        # Add keyword search
-        search_conditions.append(FAQ.keywords.op('?')(query_lower))
-        
-        # Execute search
-        faq_query = self.db.query(FAQ).filter(
-            FAQ.is_active == True,
-            or_(*search_conditions)
-        )
-        
-        # Order by priority and limit results
-        faqs = faq_query.order_by(FAQ.priority.desc()).limit(5).all()
-        
-        if faqs:
-            best_faq = faqs[0]
-            
-            # Get answer in requested language, fallback to English
-            answer = getattr(best_faq, answer_col) or best_faq.answer_en
-            question = getattr(best_faq, question_col) or best_faq.question_en
-            
-            response = {
-                "source": "faq",
-                "confidence": 0.9,
-                "answer": answer,
-                "question": question,
-                "category": best_faq.category,
-                "faq_id": best_faq.id,
-                "language": language
-            }
-            
-            self._cache_response(cache_key, response)
-            return response
+        # Rank candidates with the BM25 or full-text index, then load the best
+        # still-active FAQ by primary key
+        for faq_id, score in await self._rank_faqs(db, query, language):
+            faq = await db.get(FAQ, faq_id)
+            if faq is not None and faq.is_active:
+                response = self._faq_response(faq, score, language)
+                await self._cache_response(cache_key, response)
+                return response
         
         return None
     
-    def l2_semantic_search(self, query: str, language: str = "en") -> Optional[Dict]:
-        """Level 2: Semantic search through document corpus"""
-        cache_key = self._get_cache_key(f"semantic:{query}", language)
-        cached = self._get_cached_response(cache_key)
+    async def l2_semantic_search(self, db: AsyncSession, query: str, language: str = "en", deadline: Optional[Deadline] = None,
+                                 scoring: Optional[asyncio.Task] = None) -> Optional[Dict]:
+        """Level 2: Semantic search through document corpus
+
+        scoring, if given, is a corpus scoring of [query] already under way.
+        """
+        cache_key = self._get_cache_key(query, language, "semantic")
+        cached = await self._get_cached_response(cache_key)
         if cached:
             return cached
         
-        # Search through processed documents
-        documents = self.db.query(Document).filter(
-            Document.is_processed == True,
-            or_(
-                func.lower(Document.content).contains(query.lower()),
-                Document.language == language
-            )
-        ).limit(3).all()
-        
-        if documents:
-            # Simple relevance scoring based on keyword frequency
-            best_doc = documents[0]
-            content = best_doc.content[:500] + "..." if len(best_doc.content) > 500 else best_doc.content
-            
-            # Translate content if needed
-            if language != 'en' and best_doc.language == 'en':
-                try:
-                    translated = self.translator.translate(content, dest=language)
-                    content = translated.text
-                except:
-                    pass  # Keep original if translation fails
-            
-            response = {
-                "source": "semantic",
-                "confidence": 0.7,
-                "answer": content,
-                "document_id": best_doc.id,
-                "filename": best_doc.filename,
-                "language": language
-            }
-            
-            self._cache_response(cache_key, response)
+        matches = (await (scoring or self._match_documents(db, [query])))[0]
+        
+        for (document_id, chunk_id), score in matches:
+            if score <= 0:
+                break
+            document = await db.get(Document, document_id)
+            if document is None or not document.is_processed:
+                continue
+            chunk = await db.get(DocumentChunk, chunk_id) if chunk_id is not None else None
+            response, complete = await self._semantic_response(document, chunk, score, language, deadline)
+            if complete:
+                await self._cache_response(cache_key, response)
             return response
         
         return None
     
+    async def _semantic_response(self, document: Document, chunk: Optional[DocumentChunk], score: float, language: str,
+                                 deadline: Optional[Deadline] = None) -> Tuple[Dict, bool]:
+        """Response for a matched passage, and whether it is complete enough to cache"""
+        passage = chunk.content if chunk is not None else document.content
+        content = passage[:500] + "..." if len(passage) > 500 else passage
+        complete = True
+        
+        # Translate content if needed
+        if language != 'en' and document.language == 'en':
+            # Keeps the original if translation fails, times out or is out of budget;
+            # that untranslated answer is served once but never cached
+            original = content
+            content = await self.translation_service.translate(content, language, 'en', deadline, "answer_translation")
+            complete = content != original
+        
+        return {
+            "source": "semantic",
+            "confidence": round(min(score * settings.SEMANTIC_SCORE_SCALE, 1.0), 4),
+            "answer": content,
+            "document_id": document.id,
+            "chunk_id": chunk.id if chunk is not None else None,
+            "filename": document.filename,
+            "language": language
+        }, complete
+    
     def fallback_response(self, query: str, intent: str, language: str = "en") -> Dict:
         """Generate fallback response when no good match found"""
         fallback_messages = {
@@ -224,17 +273,156 @@ class MultilingualRetrievalPipeline:
             "language": language
         }
     
-    def search(self, query: str, intent: str, language: str = "en") -> Dict:
-        """Main search function that tries L1, then L2, then fallback"""
-        # Try L1 FAQ search first
-        result = self.l1_faq_search(query, intent, language)
-        if result and result["confidence"] >= settings.CONFIDENCE_THRESHOLD:
-            return result
+    async def _search_concurrent(self, db: AsyncSession, query: str, intent: str, language: str, deadline: Optional[Deadline]) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """L1 alongside L2's corpus scoring; the rest of L2 waits for an L1 miss
+
+        Only the scoring runs early, on the blocking executor. Loading the
+        match and translating it happen on the request's own session once L1
+        has decided, so a confident L1 hit costs no extra connection and no
+        thrown-away translation.
+        """
+        scoring = asyncio.create_task(self._match_documents(db, [query]))
+        try:
+            with stage_timer("retrieval_l1", language):
+                l1_result = await self.l1_faq_search(db, query, intent, language)
+            if l1_result and l1_result["confidence"] >= settings.CONFIDENCE_THRESHOLD:
+                return l1_result, None
+            with stage_timer("retrieval_l2", language):
+                return l1_result, await self.l2_semantic_search(db, query, language, deadline, scoring)
+        finally:
+            if not scoring.done():
+                scoring.cancel()
+                # Nobody awaits a cancelled scoring; consume its outcome so errors are not logged as unretrieved
+                scoring.add_done_callback(lambda task: task.cancelled() or task.exception())
+    
+    async def search(self, db: AsyncSession, query: str, intent: str, language: str = "en", deadline: Optional[Deadline] = None) -> Dict:
+        """Main search function: L1 if confident, else L2, else fallback
+
+        With RETRIEVAL_FANOUT (in-memory backend only), L2's corpus scoring
+        starts together with L1, so an L1 miss does not wait for L1 + scoring
+        in sequence; the answer is the same either way.
+        With a deadline, an exhausted budget goes straight to the fallback and
+        a nearly exhausted one skips L2, settling for a weaker L1 match.
+        """
+        if deadline is not None and deadline.expired:
+            deadline.skip("retrieval")
+            return self.fallback_response(query, intent, language)
         
-        # Try L2 semantic search
-        result = self.l2_semantic_search(query, language)
+        run_l2 = deadline is None or deadline.allows(settings.L2_MIN_BUDGET_MS / 1000)
+        if not run_l2:
+            deadline.skip("retrieval_l2")
+        
+        # Postgres scoring would need a second pooled session per request
+        if run_l2 and settings.RETRIEVAL_FANOUT and settings.RETRIEVAL_BACKEND != "postgres":
+            l1_result, l2_result = await self._search_concurrent(db, query, intent, language, deadline)
+        else:
+            # Try L1 FAQ search first
+            with stage_timer("retrieval_l1", language):
+                l1_result = await self.l1_faq_search(db, query, intent, language)
+            l2_result = None
+            if run_l2 and not (l1_result and l1_result["confidence"] >= settings.CONFIDENCE_THRESHOLD):
+                # Try L2 semantic search
+                with stage_timer("retrieval_l2", language):
+                    l2_result = await self.l2_semantic_search(db, query, language, deadline)
+        
+        if l1_result and l1_result["confidence"] >= settings.CONFIDENCE_THRESHOLD:
+            return l1_result
+        result = l2_result if run_l2 else l1_result
         if result and result["confidence"] >= settings.FALLBACK_THRESHOLD:
             return result
         
         # Fallback response
-        return self.fallback_response(query, intent, language)
\ No newline at end of file
+        return self.fallback_response(query, intent, language)
+    
+    async def search_batch(self, db: AsyncSession, queries: List[Tuple[str, str, str]], deadline: Optional[Deadline] = None) -> List[Dict]:
+        """search() for many (query, intent, language) triples with shared round trips
+
+        Each tier does one cache MGET, one IN query for the rows it needs and
+        (for L2) one matrix product over all queries, instead of per-query calls.
+        One deadline covers the whole batch.
+        """
+        results: List[Optional[Dict]] = [None] * len(queries)
+        
+        # L1: cached answers, then BM25 candidates loaded with a single query
+        with stage_timer("retrieval_l1_batch"):
+            faq_keys = [self._get_cache_key(query, language, "faq") for query, _, language in queries]
+            l1 = await self._get_cached_many(faq_keys)
+            uncached = [i for i in range(len(queries)) if l1[i] is None]
+            candidates = dict(zip(uncached, await self._rank_faqs_many(
+                db, [(queries[i][0], queries[i][2]) for i in uncached]
+            )))
+            faq_ids = {faq_id for ranked in candidates.values() for faq_id, _ in ranked}
+            faqs = {}
+            if faq_ids:
+                rows = await db.execute(select(FAQ).where(FAQ.id.in_(faq_ids), FAQ.is_active == True))
+                faqs = {faq.id: faq for faq in rows.scalars()}
+            fresh = {}
+            for i, ranked in candidates.items():
+                for faq_id, score in ranked:
+                    if faq_id in faqs:
+                        l1[i] = fresh[faq_keys[i]] = self._faq_response(faqs[faq_id], score, queries[i][2])
+                        break
+            await self._cache_many(fresh)
+        
+        pending = []
+        for i, result in enumerate(l1):
+            if result and result["confidence"] >= settings.CONFIDENCE_THRESHOLD:
+                results[i] = result
+            else:
+                pending.append(i)
+        
+        if pending and deadline is not None and not deadline.allows(settings.L2_MIN_BUDGET_MS / 1000):
+            deadline.skip("retrieval_l2")
+            for i in pending:
+                query, intent, language = queries[i]
+                if l1[i] and l1[i]["confidence"] >= settings.FALLBACK_THRESHOLD:
+                    results[i] = l1[i]
+                else:
+                    results[i] = self.fallback_response(query, intent, language)
+            return results
+        
+        # L2: cached passages, then one batched vector search for the rest
+        with stage_timer("retrieval_l2_batch"):
+            semantic_keys = {i: self._get_cache_key(queries[i][0], queries[i][2], "semantic") for i in pending}
+            l2 = dict(zip(pending, await self._get_cached_many([semantic_keys[i] for i in pending])))
+            misses = [i for i in pending if l2[i] is None]
+            if misses:
+                matches = dict(zip(misses, await self._match_documents(db, [queries[i][0] for i in misses])))
+                document_ids = {document_id for ranked in matches.values() for (document_id, _), score in ranked if score > 0}
+                chunk_ids = {chunk_id for ranked in matches.values() for (_, chunk_id), score in ranked if score > 0 and chunk_id is not None}
+                documents, chunks = {}, {}
+                if document_ids:
+                    rows = await db.execute(select(Document).where(Document.id.in_(document_ids), Document.is_processed == True))
+                    documents = {document.id: document for document in rows.scalars()}
+                if chunk_ids:
+                    rows = await db.execute(select(DocumentChunk).where(DocumentChunk.id.in_(chunk_ids)))
+                    chunks = {chunk.id: chunk for chunk in rows.scalars()}
+            
+                best = {}
+                for i, ranked in matches.items():
+                    for (document_id, chunk_id), score in ranked:
+                        if score <= 0:
+                            break
+                        if document_id in documents:
+                            best[i] = (documents[document_id], chunks.get(chunk_id), score)
+                            break
+                # Translations of the chosen passages run concurrently
+                responses = await asyncio.gather(*(
+                    self._semantic_response(document, chunk, score, queries[i][2], deadline)
+                    for i, (document, chunk, score) in best.items()
+                ))
+                fresh = {}
+                for i, (response, complete) in zip(best, responses):
+                    l2[i] = response
+                    if complete:
+                        fresh[semantic_keys[i]] = response
+                await self._cache_many(fresh)
+        
+        for i in pending:
+            query, intent, language = queries[i]
+            if l2[i] and l2[i]["confidence"] >= settings.FALLBACK_THRESHOLD:
+                results[i] = l2[i]
+            else:
+                results[i] = self.fallback_response(query, intent, language)
+        
+        return results
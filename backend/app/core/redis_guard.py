@@ -0,0 +1,262 @@
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import inspect
+import time
+
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+
+from app.core.config import settings
+
+# Errors that mean "Redis is unreachable or too slow", as opposed to bad
+# commands (ResponseError) that say nothing about availability
+AVAILABILITY_ERRORS = (RedisConnectionError, RedisTimeoutError, asyncio.TimeoutError, OSError)
+
+
+class RedisUnavailable(RedisConnectionError):
+    """Raised without touching the network while the circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """Closed -> open after consecutive failures; half-open lets one probe through"""
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 5.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._stats = {"short_circuited": 0, "trips": 0}
+
+    def allow(self) -> bool:
+        """Whether a call may go to Redis now"""
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        self._stats["short_circuited"] += 1
+        return False
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def release_probe(self):
+        """A probe ended without an answer either way (e.g. the request was cancelled)"""
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self._stats["trips"] += 1
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+    def stats(self) -> Dict:
+        return {"state": self.state, "consecutive_failures": self.failures, **self._stats}
+
+
+class LocalTTLCache:
+    """Bounded in-process LRU whose entries expire like their Redis counterparts"""
+
+    def __init__(self, max_entries: int = 10000, default_ttl: float = 300):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        ttl = self.default_ttl if ttl is None else min(ttl, self.default_ttl)
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, *keys: Hashable):
+        for key in keys:
+            self._entries.pop(key, None)
+
+
+class GuardedPipeline:
+    """Pipeline whose execute() goes through the breaker; SETEX also fills the local cache"""
+
+    def __init__(self, guard: "GuardedRedis", pipeline):
+        self._guard = guard
+        self._pipeline = pipeline
+
+    async def __aenter__(self) -> "GuardedPipeline":
+        await self._pipeline.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return await self._pipeline.__aexit__(*exc_info)
+
+    def __getattr__(self, name: str):
+        command = getattr(self._pipeline, name)
+
+        def queue(*args, **kwargs):
+            command(*args, **kwargs)
+            return self
+
+        return queue
+
+    def setex(self, key: str, ttl: int, value: Any) -> "GuardedPipeline":
+        self._guard.local.set(key, value, ttl)
+        self._pipeline.setex(key, ttl, value)
+        return self
+
+    async def execute(self) -> List:
+        return await self._guard._call(self._pipeline.execute)
+
+
+class GuardedRedis:
+    """Async Redis client behind a circuit breaker with an in-process fallback cache
+
+    Every command fails fast with RedisUnavailable while the breaker is open,
+    so an outage costs a dictionary lookup instead of a connect timeout.
+    GET/MGET fall back to a small local TTL cache that only SETEX fills, so
+    keys this worker wrote keep being served while Redis is unreachable;
+    successful reads never touch it.
+    Commands without a wrapper here go through the breaker via __getattr__.
+    """
+
+    def __init__(self, client, breaker: CircuitBreaker, local: LocalTTLCache):
+        self.client = client
+        self.breaker = breaker
+        self.local = local
+        self._stats = {"fallback_hits": 0, "fallback_misses": 0}
+
+    async def _call(self, command, *args, **kwargs):
+        if not self.breaker.allow():
+            raise RedisUnavailable("Redis circuit breaker is open")
+        try:
+            result = await command(*args, **kwargs)
+        except AVAILABILITY_ERRORS:
+            self.breaker.record_failure()
+            raise
+        except asyncio.CancelledError:
+            self.breaker.release_probe()
+            raise
+        except Exception:
+            # The server answered; the command itself was wrong
+            self.breaker.record_success()
+            raise
+        self.breaker.record_success()
+        return result
+
+    def _fallback(self, key: str) -> Optional[Any]:
+        value = self.local.get(key)
+        self._stats["fallback_hits" if value is not None else "fallback_misses"] += 1
+        return value
+
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            value = await self._call(self.client.get, key)
+        except AVAILABILITY_ERRORS:
+            return self._fallback(key)
+        return value
+
+    async def mget(self, *keys) -> List[Optional[Any]]:
+        keys = list(keys[0]) if len(keys) == 1 and isinstance(keys[0], (list, tuple)) else list(keys)
+        try:
+            values = await self._call(self.client.mget, keys)
+        except AVAILABILITY_ERRORS:
+            return [self._fallback(key) for key in keys]
+        return values
+
+    async def setex(self, key: str, ttl: int, value: Any):
+        self.local.set(key, value, ttl)
+        try:
+            return await self._call(self.client.setex, key, ttl, value)
+        except AVAILABILITY_ERRORS:
+            # The local copy keeps serving it until Redis is back
+            return None
+
+    async def delete(self, *keys: str):
+        self.local.delete(*keys)
+        return await self._call(self.client.delete, *keys)
+
+    async def incr(self, key: str, amount: int = 1):
+        return await self._call(self.client.incr, key, amount)
+
+    async def exists(self, *keys: str):
+        return await self._call(self.client.exists, *keys)
+
+    async def hgetall(self, key: str) -> Dict:
+        return await self._call(self.client.hgetall, key)
+
+    async def ping(self):
+        return await self._call(self.client.ping)
+
+    def pipeline(self, transaction: bool = True) -> GuardedPipeline:
+        return GuardedPipeline(self, self.client.pipeline(transaction=transaction))
+
+    async def scan_iter(self, match: Optional[str] = None, count: Optional[int] = None):
+        if not self.breaker.allow():
+            raise RedisUnavailable("Redis circuit breaker is open")
+        try:
+            async for key in self.client.scan_iter(match=match, count=count):
+                yield key
+        except AVAILABILITY_ERRORS:
+            self.breaker.record_failure()
+            raise
+        finally:
+            self.breaker.release_probe()
+        self.breaker.record_success()
+
+    async def _await(self, awaitable):
+        try:
+            return await self._call(lambda: awaitable)
+        finally:
+            # Never sent when the breaker is open; close it so it is not left dangling
+            if inspect.iscoroutine(awaitable):
+                awaitable.close()
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self.client, name)
+        if not callable(attribute):
+            return attribute
+
+        def guarded(*args, **kwargs):
+            # redis-py commands return awaitables; helpers like lock() or pubsub() do not
+            result = attribute(*args, **kwargs)
+            return self._await(result) if inspect.isawaitable(result) else result
+
+        return guarded
+
+    def stats(self) -> Dict:
+        return {
+            "breaker": self.breaker.stats(),
+            "fallback_cache_size": len(self.local),
+            **self._stats
+        }
+
+
+def create_guarded_redis(client) -> GuardedRedis:
+    return GuardedRedis(
+        client,
+        CircuitBreaker(settings.REDIS_BREAKER_FAILURES, settings.REDIS_BREAKER_RESET_SECONDS),
+        LocalTTLCache(settings.REDIS_FALLBACK_CACHE_SIZE, settings.REDIS_FALLBACK_TTL)
+    )
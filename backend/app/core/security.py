@@ -0,0 +1,101 @@
+from typing import Dict, Optional, Tuple
+from collections import OrderedDict
+import hashlib
+import time
+
+from jose import jwt
+from passlib.context import CryptContext
+
+from app.core.config import settings
+from app.core.executor import run_password_hashing
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+async def hash_password(password: str) -> str:
+    return await run_password_hashing(pwd_context.hash, password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await run_password_hashing(pwd_context.verify, plain_password, hashed_password)
+
+
+class TokenCache:
+    """Bounded LRU of verified JWT claims, each kept until the token's exp"""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        # sha256(token) -> (exp as a Unix timestamp, claims)
+        self._entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0}
+
+    def verify(self, token: str) -> Dict:
+        """Decoded claims of a valid token; raises JWTError otherwise"""
+        key = hashlib.sha256(token.encode()).hexdigest()
+        entry = self._entries.get(key)
+        if entry is not None:
+            exp, claims = entry
+            if exp > time.time():
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return claims
+            del self._entries[key]
+
+        self._stats["misses"] += 1
+        claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        exp = claims.get("exp")
+        if exp is not None:
+            self._entries[key] = (float(exp), claims)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return claims
+
+    def forget_subject(self, subject: str):
+        """Drop every cached token issued to a user (e.g. on deactivation)"""
+        for key in [key for key, (_, claims) in self._entries.items() if claims.get("sub") == subject]:
+            del self._entries[key]
+
+    def stats(self) -> Dict:
+        return {**self._stats, "size": len(self._entries)}
+
+
+class TTLCache:
+    """Bounded in-process cache whose entries expire after a fixed TTL
+
+    Entries are kept in insertion order, which with a fixed TTL is also expiry
+    order: set() drops expired entries from the front, then the oldest ones
+    past max_entries.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 1000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, object]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[object]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        return value
+
+    def set(self, key: str, value: object):
+        now = time.monotonic()
+        self._entries.pop(key, None)
+        self._entries[key] = (now + self.ttl, value)
+        while self._entries:
+            expires_at, _ = next(iter(self._entries.values()))
+            if expires_at > now and len(self._entries) <= self.max_entries:
+                break
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: str):
+        self._entries.pop(key, None)
+
+
+token_cache = TokenCache(settings.AUTH_TOKEN_CACHE_SIZE)
+# Admin rows by username; other workers see a deactivation within ADMIN_CACHE_TTL
+admin_cache = TTLCache(settings.ADMIN_CACHE_TTL, settings.ADMIN_CACHE_SIZE)
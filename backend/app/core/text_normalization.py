@@ -0,0 +1,86 @@
+from typing import Dict, Optional
+import unicodedata
+
+from app.core.config import settings
+
+# Zero-width characters that users' keyboards insert inconsistently in Indic text
+ZERO_WIDTH = dict.fromkeys(map(ord, "\u200b\u200c\u200d\u2060\ufeff"), None)
+
+# After NFKC the precomposed nukta letters (क़ ख़ ग़ ज़ ड़ ढ़ फ़ य़) are decomposed,
+# so dropping the nukta folds both spellings onto the base letter
+NUKTA = "\u093c"
+
+class PunctuationTable(dict):
+    """str.translate table mapping punctuation and symbols to a space
+
+    Filled one code point at a time as text is seen, instead of classifying
+    the whole of Unicode at import time.
+    """
+
+    def __missing__(self, code: int):
+        # Mapping a character to its own ordinal leaves it unchanged
+        value = " " if unicodedata.category(chr(code))[0] in ("P", "S") else code
+        self[code] = value
+        return value
+
+
+PUNCTUATION = PunctuationTable()
+
+STOPWORDS = {
+    "en": {"a", "an", "the", "is", "are", "was", "were", "be", "to", "of", "for", "in", "on", "at", "and", "or", "my", "me", "i", "do", "does", "can", "please", "what", "whats", "s"},
+    "hi": {"है", "हैं", "का", "की", "के", "में", "से", "को", "और", "क्या", "मैं", "मुझे", "कृपया", "भी", "तो", "यह", "वह"},
+    "mr": {"आहे", "आहेत", "चा", "ची", "चे", "मध्ये", "ला", "आणि", "काय", "मी", "मला", "कृपया", "पण", "हे", "ते"},
+    "ta": {"என்ன", "மற்றும்", "ஒரு", "இது", "அது", "நான்", "எனக்கு", "தயவுசெய்து"},
+    "te": {"ఏమి", "మరియు", "ఒక", "ఇది", "అది", "నేను", "నాకు", "దయచేసి"},
+}
+
+
+def normalize_text(text: str, language: Optional[str] = None, strip_stopwords: bool = False) -> str:
+    """Canonical form: NFKC, no zero-width chars or nukta, case-folded, punctuation and whitespace collapsed"""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKC", text).translate(ZERO_WIDTH).replace(NUKTA, "")
+    tokens = text.casefold().translate(PUNCTUATION).split()
+    if strip_stopwords and language in STOPWORDS:
+        # A query made only of stopwords keeps them rather than becoming empty
+        tokens = [token for token in tokens if token not in STOPWORDS[language]] or tokens
+    return " ".join(tokens)
+
+
+def normalize_whitespace(text: str) -> str:
+    """Light form for keys whose values must keep the original text: NFC, whitespace collapsed"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class NormalizationStats:
+    """Counts how often canonicalization changes a query, i.e. merges cache keys"""
+
+    def __init__(self):
+        self.queries = 0
+        self.changed = 0
+
+    def record(self, raw: str, canonical: str):
+        self.queries += 1
+        if raw != canonical:
+            self.changed += 1
+
+    def stats(self) -> Dict:
+        return {
+            "queries": self.queries,
+            "changed": self.changed,
+            "change_rate": round(self.changed / self.queries, 4) if self.queries else 0.0
+        }
+
+
+normalization_stats = NormalizationStats()
+
+
+def canonical_query(text: str, language: Optional[str] = None, record: bool = False) -> str:
+    """Normalize a user query for cache keys; record=True counts it in normalization stats
+
+    Only the one lookup made per message records, so each message is counted once.
+    """
+    canonical = normalize_text(text, language, strip_stopwords=settings.NORMALIZE_STRIP_STOPWORDS)
+    if record:
+        normalization_stats.record(text, canonical)
+    return canonical
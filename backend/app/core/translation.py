@@ -0,0 +1,158 @@
+from typing import Dict, Optional
+from collections import OrderedDict
+import asyncio
+import hashlib
+
+from app.core.config import settings
+from app.core.database import redis_client
+from app.core.deadline import Deadline
+from app.core.executor import run_translation
+from app.core.metrics import stage_timer
+from app.core.text_normalization import normalize_whitespace
+
+
+class TranslationCache:
+    """Bounded in-process LRU in front of a shared Redis tier"""
+
+    def __init__(self, max_entries: int = 10000, ttl: int = 604800):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.redis_client = redis_client
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._stats = {"lru_hits": 0, "redis_hits": 0, "misses": 0}
+
+    def _get_cache_key(self, text: str, source: Optional[str], target: str) -> str:
+        # Case and punctuation are kept: they carry into the translation served
+        content = f"{source or 'auto'}:{target}:{normalize_whitespace(text)}"
+        return f"translation:{hashlib.md5(content.encode()).hexdigest()}"
+
+    def _remember(self, key: str, translated: str):
+        self._entries[key] = translated
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get(self, text: str, source: Optional[str], target: str) -> Optional[str]:
+        """Look up a translation in the LRU, then in Redis"""
+        key = self._get_cache_key(text, source, target)
+        translated = self._entries.get(key)
+        if translated is not None:
+            self._entries.move_to_end(key)
+            self._stats["lru_hits"] += 1
+            return translated
+
+        try:
+            translated = await self.redis_client.get(key)
+        except Exception as e:
+            print(f"Translation cache error: {e}")
+            translated = None
+
+        if translated is not None:
+            self._remember(key, translated)
+            self._stats["redis_hits"] += 1
+            return translated
+
+        self._stats["misses"] += 1
+        return None
+
+    async def set(self, text: str, source: Optional[str], target: str, translated: str):
+        """Store a translation in both tiers"""
+        key = self._get_cache_key(text, source, target)
+        self._remember(key, translated)
+        try:
+            await self.redis_client.setex(key, self.ttl, translated)
+        except Exception as e:
+            print(f"Translation cache error: {e}")
+
+    def stats(self) -> Dict:
+        lookups = sum(self._stats.values())
+        hits = self._stats["lru_hits"] + self._stats["redis_hits"]
+        return {
+            **self._stats,
+            "lru_size": len(self._entries),
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0
+        }
+
+
+class TranslationService:
+    """Cached googletrans access shared by NLU and retrieval"""
+
+    # Map our language codes to Google Translate codes
+    LANGUAGE_CODES = {'en': 'en', 'hi': 'hi', 'mr': 'mr', 'ta': 'ta', 'te': 'te'}
+
+    def __init__(self, cache: TranslationCache):
+        self.translator = None
+        self.cache = cache
+
+    def _translate_blocking(self, text: str, target: str, source: Optional[str]) -> str:
+        if self.translator is None:
+            # googletrans pulls in its own HTTP stack; load it on first use, not at startup
+            from googletrans import Translator
+            self.translator = Translator()
+        result = self.translator.translate(text, dest=target, src=source or 'auto')
+        return result.text
+
+    async def translate(self, text: str, target_lang: str, source_lang: Optional[str] = None,
+                        deadline: Optional[Deadline] = None, stage: str = "translation") -> str:
+        """Translate text, serving repeats from the cache instead of googletrans
+
+        googletrans calls are cut off after TRANSLATION_TIMEOUT_MS, or sooner
+        when the request deadline is closer. On a timeout or any other failure
+        the original text is returned and the deadline records the skipped
+        stage, so the degraded answer is not cached.
+        """
+        target = self.LANGUAGE_CODES.get(target_lang, 'en')
+        source = self.LANGUAGE_CODES.get(source_lang) if source_lang else None
+        if not text or not text.strip() or source == target:
+            return text
+
+        cached = await self.cache.get(text, source, target)
+        if cached is not None:
+            return cached
+
+        timeout = settings.TRANSLATION_TIMEOUT_MS / 1000
+        if deadline is not None:
+            if not deadline.allows(settings.TRANSLATION_MIN_BUDGET_MS / 1000):
+                deadline.skip(stage)
+                return text
+            timeout = deadline.timeout(timeout)
+
+        try:
+            with stage_timer("googletrans", target):
+                # The worker thread finishes in the background; only the wait is bounded
+                translated = await asyncio.wait_for(run_translation(self._translate_blocking, text, target, source), timeout)
+        except asyncio.TimeoutError:
+            print(f"Translation timed out after {timeout:.3f}s")
+            if deadline is not None:
+                deadline.skip(stage)
+            return text
+        except Exception as e:
+            # Failures are not cached so the next request retries
+            print(f"Translation error: {e}")
+            if deadline is not None:
+                deadline.skip(stage)
+            return text
+
+        await self.cache.set(text, source, target, translated)
+        return translated
+
+    async def translate_strict(self, text: str, target_lang: str, source_lang: Optional[str] = None, timeout: Optional[float] = None) -> str:
+        """translate() for offline jobs: raises on failure instead of returning the original text"""
+        target = self.LANGUAGE_CODES.get(target_lang, 'en')
+        source = self.LANGUAGE_CODES.get(source_lang) if source_lang else None
+        if not text or not text.strip() or source == target:
+            return text
+
+        cached = await self.cache.get(text, source, target)
+        if cached is not None:
+            return cached
+
+        with stage_timer("googletrans", target):
+            translated = await asyncio.wait_for(run_translation(self._translate_blocking, text, target, source), timeout)
+        await self.cache.set(text, source, target, translated)
+        return translated
+
+
+translation_service = TranslationService(
+    TranslationCache(settings.TRANSLATION_CACHE_SIZE, settings.TRANSLATION_CACHE_TTL)
+)
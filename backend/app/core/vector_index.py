@@ -0,0 +1,217 @@
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+import math
+import zlib
+
+import numpy as np
+from sqlalchemy import exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import Document, DocumentChunk
+from app.core.config import settings
+from app.core.executor import run_blocking
+from app.core.faq_index import tokenize
+
+
+class Embedder:
+    """Base class for pluggable text embedding models"""
+
+    # True when embedding is heavy enough that it must leave the event loop
+    blocking = False
+
+    def fit(self, texts: Sequence[str]) -> "Embedder":
+        """Embedder for this corpus; stateful embedders return a new fitted instance"""
+        return self
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Return a float32 matrix with one L2-normalized row per text"""
+        raise NotImplementedError
+
+
+class HashingEmbedder(Embedder):
+    """Offline TF-IDF embedder using signed feature hashing of words and character trigrams"""
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+        self.idf = np.ones(dim, dtype=np.float32)
+
+    def _features(self, text: str) -> Dict[int, float]:
+        features: Dict[int, float] = {}
+        for token in tokenize(text):
+            grams = [token] + [f"#{token}#"[i:i + 3] for i in range(len(token))] if len(token) > 2 else [token]
+            for position, gram in enumerate(grams):
+                # crc32 is stable across processes, unlike the builtin hash()
+                digest = zlib.crc32(gram.encode("utf-8"))
+                bucket = digest % self.dim
+                sign = 1.0 if digest & 0x80000000 else -1.0
+                weight = 1.0 if position == 0 else 0.5
+                features[bucket] = features.get(bucket, 0.0) + sign * weight
+        return features
+
+    def fit(self, texts: Sequence[str]) -> "HashingEmbedder":
+        doc_freq = np.zeros(self.dim, dtype=np.float32)
+        for text in texts:
+            buckets = list(self._features(text).keys())
+            doc_freq[buckets] += 1
+        # A new instance: queries keep using the idf that matches the live matrix
+        fitted = HashingEmbedder(self.dim)
+        fitted.idf = np.log((1 + len(texts)) / (1 + doc_freq)).astype(np.float32) + 1.0
+        return fitted
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for bucket, value in self._features(text).items():
+                # Sublinear term frequency keeps repeated words from dominating
+                matrix[row, bucket] = math.copysign(1 + math.log(abs(value)), value) if abs(value) >= 1 else value
+        matrix *= self.idf
+        return _normalize_rows(matrix)
+
+
+class TransformerEmbedder(Embedder):
+    """Mean-pooled sentence embeddings from a Hugging Face encoder"""
+
+    blocking = True
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self._tokenizer = None
+        self._model = None
+
+    def _load(self):
+        # torch/transformers are heavy, so they are only imported when this backend is used
+        from transformers import AutoModel, AutoTokenizer
+
+        self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        self._model = AutoModel.from_pretrained(self.model_name)
+        self._model.eval()
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        import torch
+
+        if self._model is None:
+            self._load()
+
+        encoded = self._tokenizer(list(texts), padding=True, truncation=True, max_length=256, return_tensors="pt")
+        with torch.no_grad():
+            output = self._model(**encoded).last_hidden_state
+        mask = encoded["attention_mask"].unsqueeze(-1).type_as(output)
+        pooled = (output * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+        return _normalize_rows(pooled.numpy().astype(np.float32))
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return np.ascontiguousarray(matrix / norms, dtype=np.float32)
+
+
+def create_embedder() -> Embedder:
+    """Build the embedder selected by EMBEDDING_BACKEND"""
+    if settings.EMBEDDING_BACKEND == "transformers":
+        return TransformerEmbedder(settings.EMBEDDING_MODEL)
+    return HashingEmbedder(settings.EMBEDDING_DIM)
+
+
+class VectorIndex:
+    """Brute-force cosine top-k over a contiguous matrix of normalized embeddings"""
+
+    # Rows scored per block when dequantizing int8 codes, bounding temporary memory
+    BLOCK_ROWS = 8192
+
+    def __init__(self, embedder: Embedder, quantize: bool = False):
+        self.quantize = quantize
+        # (embedder, keys, float32 matrix, int8 codes, per-row scales); replaced
+        # in one assignment so concurrent searches never mix old and new parts
+        self._state: Tuple[Embedder, List[Hashable], Optional[np.ndarray], Optional[np.ndarray], Optional[np.ndarray]] = (
+            embedder, [], None, None, None
+        )
+
+    @property
+    def embedder(self) -> Embedder:
+        return self._state[0]
+
+    def __len__(self) -> int:
+        return len(self._state[1])
+
+    def build(self, keys: List[Hashable], vectors: np.ndarray, embedder: Optional[Embedder] = None):
+        """Replace the index contents with the given keys and normalized vectors"""
+        embedder = embedder or self.embedder
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if self.quantize:
+            # Symmetric per-row int8 quantization: 4x smaller at rest
+            scales = np.abs(vectors).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            codes = np.round(vectors / scales[:, None]).astype(np.int8)
+            self._state = (embedder, list(keys), None, codes, scales.astype(np.float32))
+        else:
+            self._state = (embedder, list(keys), vectors, None, None)
+
+    def build_from_texts(self, keys: List[Hashable], texts: List[str]):
+        """Fit the embedder on the corpus, embed it and build the index"""
+        embedder = self.embedder.fit(texts)
+        self.build(keys, embedder.embed(texts) if texts else np.zeros((0, 1), dtype=np.float32), embedder)
+
+    def _scores(self, matrix: Optional[np.ndarray], codes: Optional[np.ndarray], scales: Optional[np.ndarray], queries: np.ndarray) -> np.ndarray:
+        if codes is None:
+            return matrix @ queries.T
+        scores = np.empty((codes.shape[0], queries.shape[0]), dtype=np.float32)
+        for start in range(0, codes.shape[0], self.BLOCK_ROWS):
+            block = codes[start:start + self.BLOCK_ROWS]
+            scores[start:start + len(block)] = (block @ queries.T) * scales[start:start + len(block), None]
+        return scores
+
+    def search_batch(self, queries: np.ndarray, top_k: int = 3) -> List[List[Tuple[Hashable, float]]]:
+        """Return the top_k (key, cosine) pairs for every row of a normalized query matrix"""
+        return self._search(self._state, queries, top_k)
+
+    def _search(self, state: Tuple, queries: np.ndarray, top_k: int) -> List[List[Tuple[Hashable, float]]]:
+        _, keys, matrix, codes, scales = state
+        if not keys:
+            return [[] for _ in range(len(queries))]
+
+        scores = self._scores(matrix, codes, scales, np.asarray(queries, dtype=np.float32))
+        k = min(top_k, len(keys))
+        # argpartition finds the top-k in O(n); only those k get fully sorted
+        candidates = np.argpartition(-scores, k - 1, axis=0)[:k]
+        results = []
+        for column in range(scores.shape[1]):
+            rows = candidates[:, column]
+            rows = rows[np.argsort(-scores[rows, column])]
+            results.append([(keys[row], float(scores[row, column])) for row in rows])
+        return results
+
+    def search_texts(self, texts: List[str], top_k: int = 3) -> List[List[Tuple[Hashable, float]]]:
+        """Embed many queries at once and score them with one matrix product"""
+        # One snapshot: queries are embedded by the embedder fitted for this matrix
+        state = self._state
+        return self._search(state, state[0].embed(texts), top_k)
+
+    def search(self, query: str, top_k: int = 3) -> List[Tuple[Hashable, float]]:
+        """Embed a query and return its top_k (key, cosine) matches"""
+        return self.search_texts([query], top_k)[0]
+
+
+async def load_document_index(db: AsyncSession) -> Dict:
+    """Build the shared document index from processed chunks and unchunked documents"""
+    chunk_rows = (await db.execute(
+        select(DocumentChunk.document_id, DocumentChunk.id, DocumentChunk.content)
+        .join(Document, Document.id == DocumentChunk.document_id)
+        .where(Document.is_processed == True)
+    )).all()
+    # Documents loaded by hand before ingestion existed have no chunk rows
+    document_rows = (await db.execute(
+        select(Document.id, Document.content).where(
+            Document.is_processed == True,
+            Document.content.isnot(None),
+            ~exists().where(DocumentChunk.document_id == Document.id)
+        )
+    )).all()
+
+    keys = [(row.document_id, row.id) for row in chunk_rows] + [(row.id, None) for row in document_rows]
+    texts = [row.content or "" for row in chunk_rows] + [row.content for row in document_rows]
+    # Embedding the corpus is CPU work; keep it off the event loop
+    await run_blocking(document_index.build_from_texts, keys, texts)
+    return {"chunks": len(chunk_rows), "documents": len(document_rows), "quantized": document_index.quantize}
+
+
+document_index = VectorIndex(create_embedder(), quantize=settings.VECTOR_INT8)
@@ -1,25 +1,38 @@
 from fastapi import FastAPI, HTTPException, Depends, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from fastapi.security import HTTPBearer
 from sqlalchemy.orm import Session
 import uvicorn
 import os
+import asyncio
+from contextlib import asynccontextmanager
+from sqlalchemy import text
 from dotenv import load_dotenv
 
-from app.core.database import get_db, engine
-from app.models import models
+from app.core.database import get_db, pool_stats, redis_client, AsyncSessionLocal
+from app.core.metrics import Gauge, registry
+from app.services.container import services
 from app.api import chat, admin, auth
 from app.core.config import settings
 
 load_dotenv()
 
-# Create database tables
-models.Base.metadata.create_all(bind=engine)
+# Tables are created and altered by migrations (alembic upgrade head), not at import
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pools, indexes and background workers live exactly as long as the app
+    await services.start()
+    app.state.services = services
+    yield
+    await services.stop()
 
 app = FastAPI(
     title="Campus AI Assistant API",
     description="Multilingual chatbot API for campus queries",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -34,6 +47,27 @@ app.add_middleware(
 # Security
 security = HTTPBearer()
 
+registry.register(Gauge(
+    "campus_message_queue_depth",
+    "Chat rows waiting in the write-behind queue",
+    lambda: services.writer.stats()["queue_depth"]
+))
+registry.register(Gauge(
+    "campus_db_pool_checked_out",
+    "Database connections currently checked out",
+    lambda: pool_stats()["database"].get("checked_out", 0)
+))
+registry.register(Gauge(
+    "campus_redis_pool_in_use",
+    "Redis connections currently in use",
+    lambda: pool_stats()["redis"]["in_use"]
+))
+registry.register(Gauge(
+    "campus_redis_breaker_open",
+    "1 while the Redis circuit breaker is open or half-open",
+    lambda: int(redis_client.breaker.state != "closed")
+))
+
 # Include routers
 app.include_router(chat.router, prefix="/api/v1/chat", tags=["chat"])
 app.include_router(admin.router, prefix="/api/v1/admin", tags=["admin"])
@@ -43,9 +77,41 @@ app.include_router(auth.router, prefix="/api/v1/auth", tags=["authentication"])
 async def root():
     return {"message": "Campus AI Assistant API", "version": "1.0.0", "status": "running"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus text exposition of pipeline latency histograms"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+async def _database_connected() -> bool:
+    try:
+        async with AsyncSessionLocal() as db:
+            await asyncio.wait_for(db.execute(text("SELECT 1")), timeout=1.0)
+        return True
+    except Exception:
+        return False
+
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "database": "connected", "supported_languages": settings.SUPPORTED_LANGUAGES}
+    database = await _database_connected()
+    redis = redis_client.stats()
+    # Redis down is survivable (breaker + local cache); the database is not
+    if not database:
+        status = "unhealthy"
+    elif redis["breaker"]["state"] != "closed":
+        status = "degraded"
+    else:
+        status = "healthy"
+    return {
+        "status": status,
+        "database": "connected" if database else "unavailable",
+        "redis": redis,
+        "supported_languages": settings.SUPPORTED_LANGUAGES
+    }
+
+@app.get("/health/pools")
+async def pool_health():
+    """Connection pool occupancy and write-behind queue state"""
+    return services.stats()
 
 if __name__ == "__main__":
     uvicorn.run(
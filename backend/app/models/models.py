@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -53,6 +53,11 @@ class Message(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     conversation = relationship("Conversation", back_populates="messages")
+    
+    __table_args__ = (
+        # Serves keyset-paginated history: one range scan per page
+        Index("ix_messages_conversation_created_id", "conversation_id", "created_at", "id"),
+    )
 
 class Document(Base):
     __tablename__ = "documents"
@@ -61,11 +66,21 @@ class Document(Base):
     filename = Column(String(255), nullable=False)
     file_type = Column(String(20))
     content = Column(Text)
-    metadata = Column(JSON)
+    doc_metadata = Column("metadata", JSON)  # "metadata" is reserved on declarative classes
     is_processed = Column(Boolean, default=False)
     language = Column(String(5), default="en")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+class DocumentChunk(Base):
+    __tablename__ = "document_chunks"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    document_id = Column(Integer, ForeignKey("documents.id"), index=True)
+    chunk_index = Column(Integer)
+    content = Column(Text)
+    language = Column(String(5), default="en")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
 class Admin(Base):
     __tablename__ = "admins"
     
@@ -0,0 +1,106 @@
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import json
+
+from app.core.config import settings
+from app.core.content_generation import GENERATION_KEY, ContentGeneration, content_generation
+from app.core.database import redis_client
+from app.core.metrics import stage_timer
+from app.core.text_normalization import canonical_query
+
+
+class AnswerCache:
+    """Whole-response cache keyed on (canonical text, language, intent)"""
+
+    def __init__(self, generation: ContentGeneration, ttl: int = 3600):
+        self.redis_client = redis_client
+        self.generation = generation
+        self.ttl = ttl
+        self._stats = {"hits": 0, "misses": 0, "stale": 0}
+
+    def _get_cache_key(self, text: str, language: str, intent: str, record: bool = False) -> str:
+        # Lookups record normalization stats; the matching writes do not
+        content = f"{canonical_query(text, language, record)}:{language}:{intent}"
+        return f"answer:{hashlib.md5(content.encode()).hexdigest()}"
+
+    async def get(self, text: str, language: str, intent: str) -> Optional[Dict]:
+        """Return a cached response built from the current content generation"""
+        try:
+            # One round trip fetches both the entry and the generation it must match
+            with stage_timer("answer_cache", language):
+                generation, cached = await self.redis_client.mget(GENERATION_KEY, self._get_cache_key(text, language, intent, record=True))
+        except Exception as e:
+            print(f"Answer cache error: {e}")
+            return None
+
+        self.generation.observe(int(generation or 0))
+        if cached:
+            entry = json.loads(cached)
+            if entry["generation"] == self.generation.current:
+                self._stats["hits"] += 1
+                return entry["response"]
+            self._stats["stale"] += 1
+        self._stats["misses"] += 1
+        return None
+
+    async def set(self, text: str, language: str, intent: str, response: Dict, generation: int):
+        """Cache a response computed while `generation` was current"""
+        entry = {"generation": generation, "response": response}
+        try:
+            await self.redis_client.setex(
+                self._get_cache_key(text, language, intent),
+                self.ttl,
+                json.dumps(entry, ensure_ascii=False)
+            )
+        except Exception as e:
+            print(f"Answer cache error: {e}")
+
+    async def get_many(self, keys: List[Tuple[str, str, str]]) -> List[Optional[Dict]]:
+        """get() for many (text, language, intent) triples in one round trip"""
+        if not keys:
+            return []
+        try:
+            generation, *cached = await self.redis_client.mget(
+                GENERATION_KEY, *(self._get_cache_key(*key, record=True) for key in keys)
+            )
+        except Exception as e:
+            print(f"Answer cache error: {e}")
+            return [None] * len(keys)
+
+        self.generation.observe(int(generation or 0))
+        responses = []
+        for value in cached:
+            entry = json.loads(value) if value else None
+            if entry and entry["generation"] == self.generation.current:
+                self._stats["hits"] += 1
+                responses.append(entry["response"])
+                continue
+            if entry:
+                self._stats["stale"] += 1
+            self._stats["misses"] += 1
+            responses.append(None)
+        return responses
+
+    async def set_many(self, entries: List[Tuple[Tuple[str, str, str], Dict]], generation: int):
+        """set() for many responses in one pipelined round trip"""
+        if not entries:
+            return
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for key, response in entries:
+                    entry = {"generation": generation, "response": response}
+                    pipe.setex(self._get_cache_key(*key), self.ttl, json.dumps(entry, ensure_ascii=False))
+                await pipe.execute()
+        except Exception as e:
+            print(f"Answer cache error: {e}")
+
+    def stats(self) -> Dict:
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "generation": self.generation.current,
+            "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0
+        }
+
+
+answer_cache = AnswerCache(content_generation, settings.ANSWER_CACHE_TTL)
@@ -0,0 +1,236 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import redis_client
+from app.core.redis_guard import AVAILABILITY_ERRORS
+from app.models.models import Conversation, Message
+
+TOTAL_KEY = "stats:total"
+HOUR_FORMAT = "%Y%m%d%H"
+DAY_FORMAT = "%Y%m%d"
+
+
+def _utc(value: Optional[datetime]) -> datetime:
+    if value is None:
+        return datetime.now(timezone.utc)
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def _hour_key(moment: datetime) -> str:
+    return f"stats:hour:{moment.strftime(HOUR_FORMAT)}"
+
+
+def _day_key(moment: datetime) -> str:
+    return f"stats:day:{moment.strftime(DAY_FORMAT)}"
+
+
+class ChatStats:
+    """Conversation/message counters kept in Redis hashes: all-time, hourly and daily buckets
+
+    Fields: conversations, messages, lang:<code> (conversations by language)
+    and intent:<name> (user messages by intent).
+
+    Reads fall back to an aggregate over the tables while Redis is unreachable.
+    Increments lost to an outage set needs_reconcile; the container's repair
+    loop rebuilds the counters once Redis answers again.
+    """
+
+    def __init__(self, hourly_retention_days: int = 14, daily_retention_days: int = 400):
+        self.redis_client = redis_client
+        self.hourly_ttl = hourly_retention_days * 86400
+        self.daily_ttl = daily_retention_days * 86400
+        self.needs_reconcile = False
+
+    def _fields(self, model: type, row: Dict) -> Counter:
+        fields = Counter()
+        if model is Conversation:
+            fields["conversations"] += 1
+            fields[f"lang:{row['language']}"] += 1
+        elif model is Message:
+            fields["messages"] += 1
+            if row["sender"] == "user" and row["intent"]:
+                fields[f"intent:{row['intent']}"] += 1
+        return fields
+
+    async def record(self, rows: Iterable[Tuple[type, Dict]]):
+        """Count freshly persisted rows; one MULTI applies every increment atomically"""
+        buckets: Dict[str, Counter] = defaultdict(Counter)
+        for model, row in rows:
+            fields = self._fields(model, row)
+            if not fields:
+                continue
+            moment = _utc(row.get("created_at"))
+            for key in (TOTAL_KEY, _hour_key(moment), _day_key(moment)):
+                buckets[key].update(fields)
+        if not buckets:
+            return
+
+        try:
+            async with self.redis_client.pipeline(transaction=True) as pipe:
+                for key, fields in buckets.items():
+                    for field, amount in fields.items():
+                        pipe.hincrby(key, field, amount)
+                    if key.startswith("stats:hour:"):
+                        pipe.expire(key, self.hourly_ttl)
+                    elif key.startswith("stats:day:"):
+                        pipe.expire(key, self.daily_ttl)
+                await pipe.execute()
+        except Exception as e:
+            print(f"Stats update error: {e}")
+            self.needs_reconcile = True
+
+    async def is_initialized(self) -> bool:
+        try:
+            return bool(await self.redis_client.exists(TOTAL_KEY))
+        except Exception as e:
+            print(f"Stats read error: {e}")
+            # Unknown state; the repair loop reconciles once Redis answers
+            self.needs_reconcile = True
+            return True
+
+    def _summarize(self, counters: Counter) -> Dict:
+        return {
+            "total_conversations": counters.get("conversations", 0),
+            "total_messages": counters.get("messages", 0),
+            "language_distribution": {
+                field[len("lang:"):]: count for field, count in counters.items() if field.startswith("lang:")
+            },
+            "popular_intents": {
+                field[len("intent:"):]: count for field, count in counters.items() if field.startswith("intent:")
+            }
+        }
+
+    async def totals(self, db: AsyncSession) -> Dict:
+        """All-time counters from a single hash read"""
+        try:
+            values = await self.redis_client.hgetall(TOTAL_KEY)
+        except AVAILABILITY_ERRORS as e:
+            print(f"Stats read error: {e}")
+            return await self.from_tables(db)
+        return self._summarize(Counter({field: int(count) for field, count in values.items()}))
+
+    async def window(self, db: AsyncSession, hours: Optional[int] = None, days: Optional[int] = None) -> Dict:
+        """Counters for the last N hours (hourly buckets) or N days (daily buckets)
+
+        Windows are bucket-aligned: the current, partial bucket is included.
+        """
+        now = datetime.now(timezone.utc)
+        if hours is not None:
+            keys = [_hour_key(now - timedelta(hours=offset)) for offset in range(hours)]
+            since = now.replace(minute=0, second=0, microsecond=0) - timedelta(hours=hours - 1)
+        else:
+            keys = [_day_key(now - timedelta(days=offset)) for offset in range(days)]
+            since = now.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=days - 1)
+
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.hgetall(key)
+                buckets = await pipe.execute()
+        except AVAILABILITY_ERRORS as e:
+            print(f"Stats read error: {e}")
+            return await self.from_tables(db, since)
+
+        counters = Counter()
+        for values in buckets:
+            counters.update({field: int(count) for field, count in values.items()})
+        return self._summarize(counters)
+
+    async def from_tables(self, db: AsyncSession, since: Optional[datetime] = None) -> Dict:
+        """The same summary aggregated from the tables, for when Redis is unreachable"""
+        conversations = select(Conversation.language, func.count()).group_by(Conversation.language)
+        messages = select(func.count(Message.id))
+        intents = (
+            select(Message.intent, func.count())
+            .where(Message.sender == "user", Message.intent.isnot(None))
+            .group_by(Message.intent)
+        )
+        if since is not None:
+            conversations = conversations.where(Conversation.created_at >= since)
+            messages = messages.where(Message.created_at >= since)
+            intents = intents.where(Message.created_at >= since)
+
+        counters = Counter()
+        for language, count in (await db.execute(conversations)).all():
+            counters[f"lang:{language}"] += count
+            counters["conversations"] += count
+        counters["messages"] = (await db.execute(messages)).scalar() or 0
+        for intent, count in (await db.execute(intents)).all():
+            counters[f"intent:{intent}"] += count
+
+        stats = self._summarize(counters)
+        stats["degraded"] = True
+        return stats
+
+    async def reconcile(self, db: AsyncSession) -> Dict:
+        """Rebuild every counter from the base tables and swap them in atomically"""
+        # Cleared first so increments lost while this runs still trigger another pass
+        self.needs_reconcile = False
+        dialect = db.bind.dialect.name
+        buckets: Dict[str, Counter] = defaultdict(Counter)
+
+        def add(rows: List, field_of):
+            for hour, field, count in rows:
+                keys = [TOTAL_KEY]
+                if hour is not None:
+                    moment = datetime.strptime(hour, HOUR_FORMAT).replace(tzinfo=timezone.utc)
+                    keys += [_hour_key(moment), _day_key(moment)]
+                for key in keys:
+                    buckets[key][field_of(field)] += count
+
+        hour = self._hour_expression(Conversation.created_at, dialect)
+        add((await db.execute(
+            select(hour, Conversation.language, func.count()).group_by(hour, Conversation.language)
+        )).all(), lambda language: f"lang:{language}")
+        # Every conversation row carries a language, so the lang:* sums double as the count
+        for key in list(buckets):
+            buckets[key]["conversations"] = sum(
+                count for field, count in buckets[key].items() if field.startswith("lang:")
+            )
+
+        hour = self._hour_expression(Message.created_at, dialect)
+        add((await db.execute(
+            select(hour, Message.sender, func.count()).group_by(hour, Message.sender)
+        )).all(), lambda sender: "messages")
+        add((await db.execute(
+            select(hour, Message.intent, func.count())
+            .where(Message.sender == "user", Message.intent.isnot(None))
+            .group_by(hour, Message.intent)
+        )).all(), lambda intent: f"intent:{intent}")
+
+        stale = [key async for key in self.redis_client.scan_iter(match="stats:*")]
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            if stale:
+                pipe.delete(*stale)
+            for key, fields in buckets.items():
+                fields = {field: count for field, count in fields.items() if count}
+                if fields:
+                    pipe.hset(key, mapping=fields)
+                if key.startswith("stats:hour:"):
+                    pipe.expire(key, self.hourly_ttl)
+                elif key.startswith("stats:day:"):
+                    pipe.expire(key, self.daily_ttl)
+            if TOTAL_KEY not in buckets:
+                # Marks an empty database as reconciled
+                pipe.hset(TOTAL_KEY, mapping={"conversations": 0, "messages": 0})
+            await pipe.execute()
+
+        return {
+            "buckets": len(buckets),
+            "conversations": buckets[TOTAL_KEY]["conversations"],
+            "messages": buckets[TOTAL_KEY]["messages"]
+        }
+
+    def _hour_expression(self, column, dialect: str):
+        """SQL expression rendering a timestamp as its UTC hour bucket (YYYYMMDDHH)"""
+        if dialect == "postgresql":
+            return func.to_char(func.timezone("UTC", column), "YYYYMMDDHH24")
+        return func.strftime(HOUR_FORMAT, column)
+
+
+chat_stats = ChatStats(settings.STATS_HOURLY_RETENTION_DAYS, settings.STATS_DAILY_RETENTION_DAYS)
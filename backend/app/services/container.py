@@ -0,0 +1,127 @@
+from typing import Dict, Optional
+import asyncio
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.content_generation import content_generation
+from app.core.database import AsyncSessionLocal, async_engine, pool_stats, redis_client, redis_pool
+from app.core.faq_index import load_faq_index
+from app.core.multilingual_nlu import MultilingualNLU
+from app.core.multilingual_retrieval import MultilingualRetrievalPipeline
+from app.core.translation import translation_service
+from app.core.vector_index import load_document_index
+from app.services.chat_stats import chat_stats
+from app.services.context_manager import ContextManager, ResponseGenerator
+from app.services.faq_translation import faq_translation_job
+from app.services.ingestion import ingestion_service
+from app.services.message_writer import message_writer
+
+
+class ServiceContainer:
+    """Request-path services built once and owned by the application lifespan"""
+
+    def __init__(self):
+        self.translation = translation_service
+        self.nlu = MultilingualNLU()
+        self.retrieval = MultilingualRetrievalPipeline()
+        self.context = ContextManager()
+        self.responses = ResponseGenerator()
+        self.writer = message_writer
+        self.ingestion = ingestion_service
+        self.faq_translation = faq_translation_job
+        self._stats_repair: Optional[asyncio.Task] = None
+        self.started = False
+
+    async def _warm_database(self):
+        """Open the steady-state pool up front so first requests do not pay for connects"""
+        connections = max(1, min(settings.DB_POOL_SIZE, 32))
+
+        async def ping():
+            async with async_engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+
+        await asyncio.gather(*(ping() for _ in range(connections)))
+
+    async def _warm_redis(self):
+        try:
+            await redis_client.ping()
+        except Exception as e:
+            print(f"Redis warm-up error: {e}")
+
+    async def rebuild_faq_index(self):
+        async with AsyncSessionLocal() as db:
+            print(f"FAQ index built: {await load_faq_index(db)}")
+
+    async def rebuild_document_index(self):
+        async with AsyncSessionLocal() as db:
+            print(f"Document index built: {await load_document_index(db)}")
+
+    async def rebuild_search_indexes(self):
+        await self.rebuild_faq_index()
+        await self.rebuild_document_index()
+
+    async def reconcile_chat_stats(self):
+        # Queued rows would otherwise be counted twice: once now, once when flushed
+        await self.writer.flush()
+        async with AsyncSessionLocal() as db:
+            print(f"Chat stats reconciled: {await chat_stats.reconcile(db)}")
+
+    async def _repair_chat_stats(self):
+        """Rebuild the counters after increments were lost to a Redis outage"""
+        while True:
+            await asyncio.sleep(settings.STATS_REPAIR_INTERVAL_SECONDS)
+            if not chat_stats.needs_reconcile:
+                continue
+            try:
+                await self.reconcile_chat_stats()
+            except Exception as e:
+                print(f"Chat stats repair error: {e}")
+                chat_stats.needs_reconcile = True
+
+    async def start(self):
+        await asyncio.gather(self._warm_database(), self._warm_redis())
+
+        await content_generation.sync()
+        if settings.RETRIEVAL_BACKEND == "memory":
+            await self.rebuild_search_indexes()
+            # A FAQ or Document change, here or on another worker, rebuilds only
+            # the index fed by that table
+            content_generation.add_listener(self.rebuild_faq_index, "faq")
+            content_generation.add_listener(self.rebuild_document_index, "documents")
+
+        self.writer.start()
+
+        # Uploads queued when the previous process stopped
+        resumed = await self.ingestion.resume()
+        if resumed:
+            print(f"Ingestion resumed for documents: {resumed}")
+
+        # A cold Redis has no counters yet; rebuild them once from the tables
+        if not await chat_stats.is_initialized():
+            await self.reconcile_chat_stats()
+        self._stats_repair = asyncio.create_task(self._repair_chat_stats())
+
+        self.started = True
+
+    async def stop(self):
+        if self._stats_repair is not None:
+            self._stats_repair.cancel()
+            self._stats_repair = None
+        # Drain queued chat rows before the pools go away
+        await self.writer.stop()
+        await self.ingestion.shutdown()
+        await self.faq_translation.shutdown()
+        await async_engine.dispose()
+        await redis_pool.disconnect()
+        self.started = False
+
+    def stats(self) -> Dict:
+        return {
+            "started": self.started,
+            "pools": pool_stats(),
+            "message_queue": self.writer.stats()
+        }
+
+
+services = ServiceContainer()
@@ -1,73 +1,90 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import json
 from app.core.database import redis_client
+from app.core.metrics import stage_timer
 
 class ContextManager:
-    def __init__(self, db, conversation_id: str):
-        self.db = db
-        self.conversation_id = conversation_id
+    """Per-conversation context in Redis; one instance serves every conversation
+
+    A context is three keys so every update is a field-level write, not a
+    read-modify-write of one blob: a hash of scalar state (language,
+    escalated, turn_count), a list of recent intents (newest first) and a
+    hash of entities (JSON-encoded values).
+    """
+    
+    TTL = 3600  # Seconds since the last update
+    MAX_RECENT_INTENTS = 5
+    
+    def __init__(self):
         self.redis_client = redis_client
         
-    def _get_context_key(self) -> str:
-        return f"context:{self.conversation_id}"
+    def _get_context_keys(self, conversation_id: str) -> Tuple[str, str, str]:
+        prefix = f"context:{conversation_id}"
+        return f"{prefix}:state", f"{prefix}:intents", f"{prefix}:entities"
     
-    def get_context(self) -> Dict:
+    async def get_context(self, conversation_id: str) -> Dict:
         """Get conversation context"""
-        try:
-            context_data = self.redis_client.get(self._get_context_key())
-            if context_data:
-                return json.loads(context_data)
-        except Exception as e:
-            print(f"Context retrieval error: {e}")
-        
-        # Default context
-        return {
-            "conversation_id": self.conversation_id,
+        context = {
+            "conversation_id": conversation_id,
             "recent_intents": [],
             "entities": {},
             "language": "en",
             "escalated": False,
             "turn_count": 0
         }
+        state_key, intents_key, entities_key = self._get_context_keys(conversation_id)
+        try:
+            with stage_timer("context_get"):
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    pipe.hgetall(state_key)
+                    pipe.lrange(intents_key, 0, -1)
+                    pipe.hgetall(entities_key)
+                    state, intents, entities = await pipe.execute()
+        except Exception as e:
+            print(f"Context retrieval error: {e}")
+            return context
+        
+        context["recent_intents"] = intents[::-1]  # Oldest first
+        context["entities"] = {name: json.loads(value) for name, value in entities.items()}
+        context["language"] = state.get("language", "en")
+        context["escalated"] = state.get("escalated") == "1"
+        context["turn_count"] = int(state.get("turn_count", 0))
+        return context
     
-    def update_context(self, nlu_result: Dict, search_result: Dict):
-        """Update conversation context"""
+    async def update_context(self, conversation_id: str, nlu_result: Dict, search_result: Dict):
+        """Update conversation context in one MULTI round trip
+        
+        Each field is written with its own atomic command, so concurrent
+        updates to one conversation cannot overwrite each other's intents,
+        entities or turn counts.
+        """
+        state_key, intents_key, entities_key = self._get_context_keys(conversation_id)
         try:
-            context = self.get_context()
-            
-            # Update recent intents (keep last 5)
-            recent_intents = context.get("recent_intents", [])
-            recent_intents.append(nlu_result["intent"])
-            context["recent_intents"] = recent_intents[-5:]
-            
-            # Update entities
-            if nlu_result.get("entities"):
-                context["entities"].update(nlu_result["entities"])
-            
-            # Update language preference
-            context["language"] = nlu_result["language"]
-            
-            # Update escalation status
-            if search_result.get("escalate"):
-                context["escalated"] = True
-            
-            # Increment turn count
-            context["turn_count"] = context.get("turn_count", 0) + 1
-            
-            # Cache for 1 hour
-            self.redis_client.setex(
-                self._get_context_key(),
-                3600,
-                json.dumps(context, ensure_ascii=False)
-            )
-            
+            with stage_timer("context_update", nlu_result["language"]):
+                async with self.redis_client.pipeline(transaction=True) as pipe:
+                    pipe.lpush(intents_key, nlu_result["intent"])
+                    pipe.ltrim(intents_key, 0, self.MAX_RECENT_INTENTS - 1)
+                    if nlu_result.get("entities"):
+                        pipe.hset(entities_key, mapping={
+                            name: json.dumps(value, ensure_ascii=False)
+                            for name, value in nlu_result["entities"].items()
+                        })
+                        pipe.expire(entities_key, self.TTL)
+                    state = {"language": nlu_result["language"]}
+                    if search_result.get("escalate"):
+                        state["escalated"] = "1"
+                    pipe.hset(state_key, mapping=state)
+                    pipe.hincrby(state_key, "turn_count", 1)
+                    pipe.expire(state_key, self.TTL)
+                    pipe.expire(intents_key, self.TTL)
+                    await pipe.execute()
         except Exception as e:
             print(f"Context update error: {e}")
     
-    def clear_context(self):
+    async def clear_context(self, conversation_id: str):
         """Clear conversation context"""
         try:
-            self.redis_client.delete(self._get_context_key())
+            await self.redis_client.delete(*self._get_context_keys(conversation_id))
         except Exception as e:
             print(f"Context clear error: {e}")
 
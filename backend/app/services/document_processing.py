@@ -0,0 +1,88 @@
+# CPU-bound document extraction and chunking. Everything here runs inside
+# ingestion worker processes, so it must not import the app's DB/Redis setup.
+from typing import Dict, List
+import re
+
+IMAGE_TYPES = {"png", "jpg", "jpeg", "tif", "tiff", "bmp", "gif", "webp"}
+TEXT_TYPES = {"txt", "md", "csv"}
+
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?।॥])\s+")
+
+
+def _ocr_image(image, ocr_languages: str) -> str:
+    import pytesseract
+
+    return pytesseract.image_to_string(image, lang=ocr_languages)
+
+
+def _extract_pdf(path: str, enable_ocr: bool, ocr_languages: str) -> Dict:
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    pages = []
+    ocr_pages = 0
+    for page in reader.pages:
+        text = (page.extract_text() or "").strip()
+        # Scanned pages have no text layer; OCR their embedded images instead
+        if not text and enable_ocr:
+            text = "\n".join(_ocr_image(image.image, ocr_languages) for image in page.images).strip()
+            ocr_pages += 1 if text else 0
+        pages.append(text)
+    return {"text": "\n\n".join(pages), "pages": len(reader.pages), "ocr_pages": ocr_pages}
+
+
+def extract_text(path: str, file_type: str, enable_ocr: bool, ocr_languages: str) -> Dict:
+    """Extract plain text from an uploaded file"""
+    file_type = (file_type or "").lower()
+
+    if file_type == "pdf":
+        return _extract_pdf(path, enable_ocr, ocr_languages)
+
+    if file_type in IMAGE_TYPES:
+        if not enable_ocr:
+            return {"text": "", "pages": 1, "ocr_pages": 0}
+        from PIL import Image
+
+        with Image.open(path) as image:
+            text = _ocr_image(image, ocr_languages)
+        return {"text": text, "pages": 1, "ocr_pages": 1}
+
+    if file_type in TEXT_TYPES:
+        with open(path, encoding="utf-8", errors="replace") as handle:
+            return {"text": handle.read(), "pages": 1, "ocr_pages": 0}
+
+    raise ValueError(f"Unsupported file type: {file_type}")
+
+
+def chunk_paragraphs(text: str, max_chars: int = 1000) -> List[str]:
+    """Split text on blank lines and pack paragraphs into chunks of at most max_chars"""
+    paragraphs = [" ".join(block.split()) for block in re.split(r"\n\s*\n", text or "")]
+    chunks: List[str] = []
+    current = ""
+
+    for paragraph in filter(None, paragraphs):
+        # Oversized paragraphs are broken up at sentence boundaries, then hard-wrapped
+        pieces = [paragraph] if len(paragraph) <= max_chars else SENTENCE_BOUNDARY.split(paragraph)
+        for piece in pieces:
+            if current and len(current) + len(piece) + 1 > max_chars:
+                chunks.append(current)
+                current = ""
+            while len(piece) > max_chars:
+                chunks.append(piece[:max_chars])
+                piece = piece[max_chars:]
+            current = f"{current} {piece}" if current else piece
+        # Keep paragraph boundaries when the next paragraph starts a new chunk
+        if current and len(current) >= max_chars // 2:
+            chunks.append(current)
+            current = ""
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def process_file(path: str, file_type: str, enable_ocr: bool, ocr_languages: str, max_chars: int) -> Dict:
+    """Worker entry point: extract a file's text and chunk it"""
+    extracted = extract_text(path, file_type, enable_ocr, ocr_languages)
+    extracted["chunks"] = chunk_paragraphs(extracted["text"], max_chars)
+    return extracted
@@ -0,0 +1,184 @@
+from typing import Dict, List, Optional, Tuple
+from collections import defaultdict
+from datetime import datetime, timezone
+import asyncio
+import time
+
+from sqlalchemy import and_, case, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.translation import translation_service
+from app.models.models import FAQ
+
+FIELDS = ("question", "answer")
+
+
+def _target_languages() -> List[str]:
+    return [language for language in settings.SUPPORTED_LANGUAGES if language != "en"]
+
+
+def _filled(column):
+    return and_(column.isnot(None), column != "")
+
+
+class RateLimiter:
+    """Spaces call starts at least 1/rate seconds apart across all callers"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class FAQTranslationJob:
+    """Fills empty question_xx/answer_xx FAQ columns from English, in the background
+
+    FAQs are read in id order, a batch at a time. Every missing
+    (FAQ, language, field) text in the batch is translated concurrently
+    through a rate limiter, and the batch is written back with one UPDATE per
+    column set and a single commit. A text that fails to translate is left
+    empty for the next run instead of being filled with English.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._status: Dict = {"status": "idle"}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, languages: Optional[List[str]] = None) -> Dict:
+        """Schedule a run; the caller checks `running` first"""
+        languages = languages or _target_languages()
+        self._status = {
+            "status": "running",
+            "languages": languages,
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "faqs_scanned": 0,
+            "translated": {language: 0 for language in languages},  # Columns filled
+            "failed": 0
+        }
+        self._task = asyncio.create_task(self._run(languages))
+        return self.status()
+
+    def status(self) -> Dict:
+        return dict(self._status)
+
+    async def coverage(self, db: AsyncSession) -> Dict:
+        """Per language: active FAQs whose question and answer are both filled"""
+        languages = _target_languages()
+        columns = [func.count()]
+        for language in languages:
+            question, answer = getattr(FAQ, f"question_{language}"), getattr(FAQ, f"answer_{language}")
+            columns.append(func.sum(case((and_(_filled(question), _filled(answer)), 1), else_=0)))
+        total, *filled = (await db.execute(select(*columns).where(FAQ.is_active == True))).one()
+        return {
+            language: {
+                "total": total,
+                "translated": int(count or 0),
+                "missing": total - int(count or 0),
+                "coverage": round(int(count or 0) / total, 4) if total else 1.0
+            }
+            for language, count in zip(languages, filled)
+        }
+
+    async def _translate(self, limiter: RateLimiter, semaphore: asyncio.Semaphore, text: str, language: str) -> Optional[str]:
+        async with semaphore:
+            await limiter.acquire()
+            try:
+                return await translation_service.translate_strict(text, language, "en", settings.FAQ_TRANSLATION_TIMEOUT)
+            except Exception as e:
+                print(f"FAQ translation error ({language}): {e}")
+                return None
+
+    async def _translate_batch(self, faqs: List[FAQ], languages: List[str], limiter: RateLimiter, semaphore: asyncio.Semaphore) -> Dict[int, Dict[str, str]]:
+        """Translations for every missing column in a batch, keyed by FAQ id"""
+        jobs: List[Tuple[int, str, str]] = []
+        texts = []
+        for faq in faqs:
+            for language in languages:
+                for field in FIELDS:
+                    column = f"{field}_{language}"
+                    source = getattr(faq, f"{field}_en")
+                    if not getattr(faq, column) and source:
+                        jobs.append((faq.id, column, language))
+                        texts.append(source)
+
+        results = await asyncio.gather(*(
+            self._translate(limiter, semaphore, text, language) for text, (_, _, language) in zip(texts, jobs)
+        ))
+
+        values: Dict[int, Dict[str, str]] = defaultdict(dict)
+        for (faq_id, column, language), translated in zip(jobs, results):
+            if translated:
+                values[faq_id][column] = translated
+                self._status["translated"][language] += 1
+            else:
+                self._status["failed"] += 1
+        return values
+
+    async def _write(self, db: AsyncSession, values: Dict[int, Dict[str, str]]):
+        """One executemany UPDATE per distinct set of filled columns"""
+        groups: Dict[Tuple[str, ...], List[Dict]] = defaultdict(list)
+        for faq_id, columns in values.items():
+            groups[tuple(sorted(columns))].append({"id": faq_id, **columns})
+        for rows in groups.values():
+            await db.execute(update(FAQ), rows)
+        # Committing bumps the content generation, which rebuilds the FAQ index
+        await db.commit()
+
+    async def _run(self, languages: List[str]):
+        limiter = RateLimiter(settings.FAQ_TRANSLATION_RATE)
+        semaphore = asyncio.Semaphore(settings.FAQ_TRANSLATION_CONCURRENCY)
+        missing = or_(*(
+            ~_filled(getattr(FAQ, f"{field}_{language}"))
+            for language in languages for field in FIELDS
+        ))
+        last_id = 0
+        try:
+            async with AsyncSessionLocal() as db:
+                while True:
+                    # Keyset pages: rows filled by a previous batch never come back
+                    faqs = (await db.execute(
+                        select(FAQ)
+                        .where(FAQ.is_active == True, FAQ.id > last_id, missing)
+                        .order_by(FAQ.id)
+                        .limit(settings.FAQ_TRANSLATION_BATCH_SIZE)
+                    )).scalars().all()
+                    if not faqs:
+                        break
+                    last_id = faqs[-1].id
+                    self._status["faqs_scanned"] += len(faqs)
+
+                    values = await self._translate_batch(faqs, languages, limiter, semaphore)
+                    db.expunge_all()
+                    if values:
+                        await self._write(db, values)
+
+                self._status["coverage"] = await self.coverage(db)
+            self._status["status"] = "completed"
+        except Exception as e:
+            print(f"FAQ translation job error: {e}")
+            self._status["status"] = "failed"
+            self._status["error"] = str(e)
+        self._status["finished_at"] = datetime.now(timezone.utc).isoformat()
+
+    async def shutdown(self):
+        """Stop a running job; batches already committed stay written"""
+        if self.running:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+faq_translation_job = FAQTranslationJob()
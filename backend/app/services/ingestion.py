@@ -0,0 +1,158 @@
+from typing import Dict, List, Optional, Set
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import insert, select, update
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.models import Document, DocumentChunk
+from app.services.document_processing import process_file
+
+
+class IngestionService:
+    """Runs document extraction, OCR and chunking on a pool of worker processes"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn keeps workers free of the parent's event loop, threads and sockets
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    def submit(self, document_id: int, path: str, file_type: str) -> asyncio.Task:
+        """Schedule a stored upload for background ingestion"""
+        task = asyncio.create_task(self.ingest(document_id, path, file_type))
+        # Hold a reference so the task is not garbage collected mid-flight
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+        return task
+
+    def _task_done(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Ingestion task error: {task.exception()}")
+
+    async def resume(self) -> List[int]:
+        """Resubmit documents a previous process left queued (e.g. across a restart)"""
+        async with AsyncSessionLocal() as db:
+            documents = (await db.execute(
+                select(Document.id, Document.file_type, Document.doc_metadata).where(Document.is_processed == False)
+            )).all()
+        resumed = []
+        for document in documents:
+            metadata = document.doc_metadata or {}
+            if metadata.get("status") != "queued":
+                continue
+            path = metadata.get("path")
+            if not path or not os.path.exists(path):
+                await self._mark_failed(document.id, "Uploaded file is missing")
+                continue
+            self.submit(document.id, path, document.file_type)
+            resumed.append(document.id)
+        return resumed
+
+    async def _mark_failed(self, document_id: int, error: str):
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(Document)
+                .where(Document.id == document_id)
+                .values(doc_metadata={"status": "failed", "error": error})
+            )
+            await db.commit()
+
+    def _remove_upload(self, path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Upload cleanup error for {path}: {e}")
+
+    async def ingest(self, document_id: int, path: str, file_type: str) -> Dict:
+        """Extract and chunk one document in a worker process, then store the chunks
+
+        The upload is removed once the document is processed or has failed.
+        """
+        try:
+            return await self._ingest(document_id, path, file_type)
+        finally:
+            self._remove_upload(path)
+
+    async def _ingest(self, document_id: int, path: str, file_type: str) -> Dict:
+        loop = asyncio.get_running_loop()
+        try:
+            extracted = await loop.run_in_executor(
+                self._get_pool(),
+                process_file,
+                path,
+                file_type,
+                settings.ENABLE_OCR,
+                settings.OCR_LANGUAGES,
+                settings.CHUNK_MAX_CHARS
+            )
+        except Exception as e:
+            print(f"Ingestion error for document {document_id}: {e}")
+            await self._mark_failed(document_id, str(e))
+            return {"document_id": document_id, "status": "failed", "error": str(e)}
+
+        try:
+            return await self._store(document_id, extracted)
+        except Exception as e:
+            print(f"Ingestion store error for document {document_id}: {e}")
+            await self._mark_failed(document_id, str(e))
+            return {"document_id": document_id, "status": "failed", "error": str(e)}
+
+    async def _store(self, document_id: int, extracted: Dict) -> Dict:
+        async with AsyncSessionLocal() as db:
+            document = await db.get(Document, document_id)
+            if document is None:
+                # Deleted while extraction ran; nothing to attach the chunks to
+                print(f"Ingestion skipped for document {document_id}: document no longer exists")
+                return {"document_id": document_id, "status": "missing"}
+            chunks = [
+                {
+                    "document_id": document_id,
+                    "chunk_index": index,
+                    "content": chunk,
+                    "language": document.language
+                }
+                for index, chunk in enumerate(extracted["chunks"])
+            ]
+            if chunks:
+                # One executemany round trip for all chunk rows
+                await db.execute(insert(DocumentChunk), chunks)
+
+            document.content = extracted["text"]
+            document.is_processed = True
+            document.doc_metadata = {
+                **{key: value for key, value in (document.doc_metadata or {}).items() if key != "path"},
+                "status": "processed",
+                "pages": extracted["pages"],
+                "ocr_pages": extracted["ocr_pages"],
+                "chunks": len(chunks)
+            }
+            # Committing bumps the content generation, which rebuilds the index
+            await db.commit()
+
+        return {"document_id": document_id, "status": "processed", "chunks": len(chunks)}
+
+    async def shutdown(self):
+        """Wait for in-flight ingestions and stop the worker processes"""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+
+ingestion_service = IngestionService(settings.INGESTION_WORKERS or None)
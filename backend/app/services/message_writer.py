@@ -0,0 +1,192 @@
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import time
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, IntegrityError
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.metrics import stage_latency
+from app.models.models import ChatSession, Conversation, Message
+from app.services.chat_stats import chat_stats
+
+# Parents before children so foreign keys hold within one batch
+WRITE_ORDER = (Conversation, ChatSession, Message)
+
+# The database rejected a row; retrying the same batch cannot succeed
+ROW_ERRORS = (IntegrityError, DataError)
+
+
+class MessageWriter:
+    """Write-behind persistence: rows are queued and inserted in batches by a background flusher"""
+
+    def __init__(self, max_queue: int = 10000, batch_size: int = 500, flush_interval_ms: int = 50, max_attempts: int = 3):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_attempts = max_attempts
+        self._queue: "asyncio.Queue[Tuple[type, Dict]]" = asyncio.Queue(maxsize=max_queue)
+        self._task: Optional[asyncio.Task] = None
+        # Rows ever queued / ever finished (written or dropped), in FIFO order
+        self._queued = 0
+        self._finished = 0
+        self._flush_waiters: List[Tuple[int, asyncio.Future]] = []
+        self._stats = {
+            "enqueued": 0,
+            "written": 0,
+            "batches": 0,
+            "failed_batches": 0,
+            "split_batches": 0,
+            "dropped": 0,
+            "backpressure_waits": 0,
+            "backpressure_wait_ms": 0.0,
+            "last_batch_rows": 0,
+            "last_flush_ms": 0.0
+        }
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def enqueue(self, rows: List[Tuple[type, Dict]]):
+        """Queue rows for insertion; waits (and records it) only when the queue is full"""
+        for row in rows:
+            try:
+                self._queue.put_nowait(row)
+            except asyncio.QueueFull:
+                start = time.perf_counter()
+                await self._queue.put(row)
+                self._stats["backpressure_waits"] += 1
+                self._stats["backpressure_wait_ms"] += (time.perf_counter() - start) * 1000
+            self._queued += 1
+        self._stats["enqueued"] += len(rows)
+
+    async def flush(self):
+        """Wait until every row queued so far has been written
+
+        Rows queued after the call are not waited for, so readers are not
+        starved while traffic keeps the queue busy.
+        """
+        if self._task is None or self._finished >= self._queued:
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._flush_waiters.append((self._queued, waiter))
+        await waiter
+
+    async def stop(self):
+        """Flush the queue and stop the background flusher"""
+        if self._task is None:
+            return
+        await self._queue.join()
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _next_batch(self) -> List[Tuple[type, Dict]]:
+        # Block for the first row, then collect until the batch fills or the interval ends
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _persist(self, batch: List[Tuple[type, Dict]]):
+        """Write a batch, retrying transient errors; a rejected row only costs itself
+
+        When the database rejects a row (unknown conversation, bad value), the
+        batch is split in halves, in queue order so parents still precede
+        children, until the offending rows are isolated and dropped.
+        """
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                await self.write(batch)
+                return
+            except ROW_ERRORS as e:
+                self._stats["failed_batches"] += 1
+                print(f"Message persistence error ({len(batch)} rows): {e}")
+                break
+            except Exception as e:
+                self._stats["failed_batches"] += 1
+                print(f"Message persistence error (attempt {attempt}): {e}")
+                if attempt == self.max_attempts:
+                    self._stats["dropped"] += len(batch)
+                    return
+                await asyncio.sleep(self.flush_interval * attempt)
+
+        if len(batch) == 1:
+            self._stats["dropped"] += 1
+            return
+        self._stats["split_batches"] += 1
+        middle = len(batch) // 2
+        await self._persist(batch[:middle])
+        await self._persist(batch[middle:])
+
+    async def _run(self):
+        while True:
+            batch = await self._next_batch()
+            await self._persist(batch)
+            for _ in batch:
+                self._queue.task_done()
+            self._finished += len(batch)
+            self._wake_flush_waiters()
+
+    def _wake_flush_waiters(self):
+        pending = []
+        for target, waiter in self._flush_waiters:
+            if target <= self._finished:
+                if not waiter.done():
+                    waiter.set_result(None)
+            else:
+                pending.append((target, waiter))
+        self._flush_waiters = pending
+
+    async def write(self, batch: List[Tuple[type, Dict]]):
+        """Insert rows in one transaction, bypassing the queue"""
+        start = time.perf_counter()
+        grouped = {model: [] for model in WRITE_ORDER}
+        for model, row in batch:
+            grouped[model].append(row)
+
+        # One transaction and one multi-row INSERT per table
+        async with AsyncSessionLocal() as db:
+            for model, rows in grouped.items():
+                if rows:
+                    await db.execute(insert(model), rows)
+            await db.commit()
+
+        # Dashboard counters follow the committed rows
+        await chat_stats.record(batch)
+
+        self._stats["written"] += len(batch)
+        self._stats["batches"] += 1
+        self._stats["last_batch_rows"] = len(batch)
+        self._stats["last_flush_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        stage_latency.observe(time.perf_counter() - start, "db_write", "")
+
+    def stats(self) -> Dict:
+        return {
+            **self._stats,
+            "backpressure_wait_ms": round(self._stats["backpressure_wait_ms"], 2),
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "running": self._task is not None
+        }
+
+
+message_writer = MessageWriter(
+    settings.MESSAGE_QUEUE_SIZE,
+    settings.MESSAGE_BATCH_SIZE,
+    settings.MESSAGE_FLUSH_INTERVAL_MS
+)
@@ -0,0 +1,101 @@
+"""Microbenchmark: per-message NLU matching cost vs. number of intents.
+
+Compares the original per-pattern ``re.findall`` loop with the single-pass
+IntentMatcher, first on the shipped intent tables (checking both produce the
+same intent, confidence and entities), then on synthetic tables with more
+intents per language.
+
+Run from backend/:  python -m benchmarks.nlu_matcher_benchmark
+"""
+import random
+import re
+import time
+
+from app.core.intent_matcher import IntentMatcher
+from app.core.multilingual_nlu import MultilingualNLU
+
+MESSAGES = [
+    "Hello, what are the hostel fees for first year 2024?",
+    "When is the final exam and where can I check my result?",
+    "How do I apply for a scholarship?",
+    "library timings please",
+    "फीस कितनी है और छात्रावास का कमरा कैसे मिलेगा?",
+    "परीक्षा का नतीजा कब आएगा? अंतिम परीक्षा",
+    "वसतिगृह शुल्क किती आहे?",
+    "கட்டணம் எவ்வளவு? தேர்வு முடிவு",
+    "హాస్టల్ ఫీజు ఎంత? పరీక్ష రిజల్ట్",
+    "hi, this is about the timetable for the internal test",
+]
+LANGUAGES = ["en", "en", "en", "en", "hi", "hi", "mr", "ta", "te", "en"]
+
+
+def legacy_match(intent_patterns, entity_patterns, text, language):
+    """The original extract_intent + extract_entities loops"""
+    text_lower = text.lower()
+    best_intent = "general"
+    best_confidence = 0.0
+    for intent, lang_patterns in intent_patterns.items():
+        for pattern in lang_patterns.get(language, lang_patterns.get("en", [])):
+            matches = re.findall(pattern, text_lower, re.IGNORECASE)
+            if matches:
+                confidence = len(matches) * 0.3 + 0.4
+                if confidence > best_confidence:
+                    best_intent = intent
+                    best_confidence = min(confidence, 0.95)
+
+    entities = {}
+    for entity, table in entity_patterns.get(best_intent, {}).items():
+        for pattern in table.get(language, table["en"]):
+            match = re.search(pattern, text, re.IGNORECASE)
+            if match:
+                entities[entity] = match.group(1)
+                break
+    return best_intent, best_confidence, entities
+
+
+def synthetic_patterns(base, copies):
+    """Grow the intent table by adding renamed copies with distinct keywords"""
+    patterns = dict(base)
+    for copy in range(copies):
+        for intent, table in base.items():
+            patterns[f"{intent}_{copy}"] = {
+                language: [p.replace("|", f"{copy}x|").replace(")", f"{copy}x)") for p in language_patterns]
+                for language, language_patterns in table.items()
+            }
+    return patterns
+
+
+def per_message_us(func, rounds=30):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text, language in zip(MESSAGES, LANGUAGES):
+            func(text, language)
+    return (time.perf_counter() - start) / (rounds * len(MESSAGES)) * 1e6
+
+
+def main():
+    nlu = MultilingualNLU()
+
+    # Equivalence on the shipped tables, including random noise strings
+    rng = random.Random(7)
+    vocabulary = " ".join(MESSAGES).split()
+    samples = list(zip(MESSAGES, LANGUAGES)) + [
+        (" ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 12))), rng.choice(["en", "hi", "mr", "ta", "te", "xx"]))
+        for _ in range(2000)
+    ]
+    for text, language in samples:
+        expected = legacy_match(nlu.intent_patterns, nlu.entity_patterns, text, language)
+        assert nlu.matcher.match(text, language) == expected, (text, language)
+    print(f"matcher agrees with the legacy loops on {len(samples)} messages")
+
+    print(f"{'intents':>8} {'legacy us/msg':>14} {'matcher us/msg':>15}")
+    for copies in (0, 3, 15, 31):
+        intent_patterns = synthetic_patterns(nlu.intent_patterns, copies)
+        matcher = IntentMatcher(intent_patterns, nlu.entity_patterns)
+        legacy = per_message_us(lambda t, l: legacy_match(intent_patterns, nlu.entity_patterns, t, l))
+        single_pass = per_message_us(matcher.match)
+        print(f"{len(intent_patterns):>8} {legacy:>14.1f} {single_pass:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Startup benchmark: how long a fresh worker takes to become ready.
+
+Each run starts a new interpreter that imports app.main and runs the app
+lifespan startup (pool warm-up, search index build, background workers)
+against the same local stand-ins as the load test: SQLite, fakeredis and a
+stub translator. Reports import and startup time per run and lists any heavy
+optional modules (torch, transformers, pandas, ...) that got imported along
+the way. Exits non-zero when the median time to ready is over --budget-ms or
+a heavy module was loaded, so it can gate CI.
+
+Requires fakeredis and aiosqlite (pip install -r requirements-bench.txt).
+Run from backend/:
+    python -m benchmarks.startup_benchmark --runs 5 --budget-ms 1000
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.chat_load_test import configure_environment, seed_database
+
+# Optional or feature-gated dependencies that must stay off the startup path
+HEAVY_MODULES = [
+    "torch", "transformers", "sklearn", "pandas", "pinecone", "openai",
+    "googletrans", "langdetect", "pytesseract", "pypdf", "PIL",
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to start")
+    parser.add_argument("--budget-ms", type=float, default=1000.0, help="Median import + startup must stay under this")
+    parser.add_argument("--database-url", default=None, help="Defaults to a fresh SQLite file in a temp dir")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+async def measure_startup(start: float):
+    from app.main import app
+    imported = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        ready = time.perf_counter()
+    return {
+        "import_ms": round((imported - start) * 1000, 1),
+        "startup_ms": round((ready - imported) * 1000, 1),
+        "ready_ms": round((ready - start) * 1000, 1),
+        "heavy_modules": [name for name in HEAVY_MODULES if name in sys.modules],
+    }
+
+
+async def prepare_database():
+    from app.core.database import async_engine
+
+    await seed_database(reset=False)
+    # Pooled aiosqlite connections keep a worker thread alive past asyncio.run()
+    await async_engine.dispose()
+
+
+def run_child(args):
+    # configure_environment already imports the database, Redis and translation
+    # modules, so the clock starts before it
+    start = time.perf_counter()
+    args.translate_latency_ms = 0.0
+    configure_environment(args)
+    print(json.dumps(asyncio.run(measure_startup(start))))
+
+
+def main():
+    args = parse_args()
+    if args.child:
+        run_child(args)
+        return
+
+    # Tables and seed FAQs are created once, outside the timed runs
+    args.translate_latency_ms = 0.0
+    configure_environment(args)
+    asyncio.run(prepare_database())
+
+    runs = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.startup_benchmark", "--child", "--database-url", args.database_url],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(f"{'run':>4} {'import ms':>10} {'startup ms':>11} {'ready ms':>9}")
+    for i, run in enumerate(runs, 1):
+        print(f"{i:>4} {run['import_ms']:>10} {run['startup_ms']:>11} {run['ready_ms']:>9}")
+    median_ready = statistics.median(run["ready_ms"] for run in runs)
+    heavy = sorted({name for run in runs for name in run["heavy_modules"]})
+    print(f"median ready {median_ready} ms (budget {args.budget_ms} ms)")
+    print(f"heavy modules imported: {', '.join(heavy) or 'none'}")
+
+    if median_ready > args.budget_ms or heavy:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
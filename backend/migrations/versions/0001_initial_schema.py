@@ -0,0 +1,125 @@
+"""Initial schema
+
+Exactly the tables the old import-time create_all() produced, so databases
+created that way can be marked with `alembic stamp 0001` and then upgraded.
+Later additions belong in their own revisions.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "faqs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("question_en", sa.Text(), nullable=False),
+        sa.Column("question_hi", sa.Text(), nullable=True),
+        sa.Column("question_mr", sa.Text(), nullable=True),
+        sa.Column("question_ta", sa.Text(), nullable=True),
+        sa.Column("question_te", sa.Text(), nullable=True),
+        sa.Column("answer_en", sa.Text(), nullable=False),
+        sa.Column("answer_hi", sa.Text(), nullable=True),
+        sa.Column("answer_mr", sa.Text(), nullable=True),
+        sa.Column("answer_ta", sa.Text(), nullable=True),
+        sa.Column("answer_te", sa.Text(), nullable=True),
+        sa.Column("category", sa.String(length=100), nullable=True),
+        sa.Column("keywords", postgresql.JSON(), nullable=True),
+        sa.Column("priority", sa.Integer(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_faqs_id"), "faqs", ["id"], unique=False)
+
+    op.create_table(
+        "conversations",
+        sa.Column("id", sa.String(length=50), nullable=False),
+        sa.Column("user_id", sa.String(length=100), nullable=True),
+        sa.Column("platform", sa.String(length=20), nullable=True),
+        sa.Column("language", sa.String(length=5), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_conversations_id"), "conversations", ["id"], unique=False)
+
+    op.create_table(
+        "messages",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("conversation_id", sa.String(length=50), nullable=True),
+        sa.Column("sender", sa.String(length=10), nullable=True),
+        sa.Column("message_text", sa.Text(), nullable=True),
+        sa.Column("intent", sa.String(length=100), nullable=True),
+        sa.Column("confidence", sa.Float(), nullable=True),
+        sa.Column("response_source", sa.String(length=20), nullable=True),
+        sa.Column("response_time_ms", sa.Integer(), nullable=True),
+        sa.Column("language", sa.String(length=5), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.ForeignKeyConstraint(["conversation_id"], ["conversations.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_messages_id"), "messages", ["id"], unique=False)
+
+    op.create_table(
+        "documents",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("filename", sa.String(length=255), nullable=False),
+        sa.Column("file_type", sa.String(length=20), nullable=True),
+        sa.Column("content", sa.Text(), nullable=True),
+        sa.Column("metadata", postgresql.JSON(), nullable=True),
+        sa.Column("is_processed", sa.Boolean(), nullable=True),
+        sa.Column("language", sa.String(length=5), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_documents_id"), "documents", ["id"], unique=False)
+
+    op.create_table(
+        "admins",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("username", sa.String(length=50), nullable=True),
+        sa.Column("email", sa.String(length=100), nullable=True),
+        sa.Column("hashed_password", sa.String(length=255), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("role", sa.String(length=20), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_admins_id"), "admins", ["id"], unique=False)
+    op.create_index(op.f("ix_admins_username"), "admins", ["username"], unique=True)
+    op.create_index(op.f("ix_admins_email"), "admins", ["email"], unique=True)
+
+    op.create_table(
+        "chat_sessions",
+        sa.Column("id", sa.String(length=50), nullable=False),
+        sa.Column("user_id", sa.String(length=100), nullable=True),
+        sa.Column("website_domain", sa.String(length=255), nullable=True),
+        sa.Column("language_preference", sa.String(length=5), nullable=True),
+        sa.Column("session_data", postgresql.JSON(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.Column("last_activity", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_chat_sessions_id"), "chat_sessions", ["id"], unique=False)
+
+
+def downgrade():
+    op.drop_table("chat_sessions")
+    op.drop_table("admins")
+    op.drop_table("documents")
+    op.drop_table("messages")
+    op.drop_table("conversations")
+    op.drop_table("faqs")
@@ -0,0 +1,40 @@
+"""Document chunks and the message history index
+
+Tables and indexes added after the initial schema: document_chunks for the
+chunked document index and the (conversation_id, created_at, id) index that
+serves keyset-paginated conversation history.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_messages_conversation_created_id", "messages", ["conversation_id", "created_at", "id"], unique=False)
+
+    op.create_table(
+        "document_chunks",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("document_id", sa.Integer(), nullable=True),
+        sa.Column("chunk_index", sa.Integer(), nullable=True),
+        sa.Column("content", sa.Text(), nullable=True),
+        sa.Column("language", sa.String(length=5), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.ForeignKeyConstraint(["document_id"], ["documents.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_document_chunks_id"), "document_chunks", ["id"], unique=False)
+    op.create_index(op.f("ix_document_chunks_document_id"), "document_chunks", ["document_id"], unique=False)
+
+
+def downgrade():
+    op.drop_table("document_chunks")
+    op.drop_index("ix_messages_conversation_created_id", table_name="messages")
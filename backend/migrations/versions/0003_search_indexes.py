@@ -0,0 +1,65 @@
+"""Full-text and trigram search indexes
+
+Generated tsvector columns (search_*) with GIN indexes back the
+RETRIEVAL_BACKEND=postgres search mode; pg_trgm GIN indexes on the FAQ
+question columns serve fuzzy matches for misspelled queries. The columns
+are maintained by Postgres and are not mapped on the ORM models.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+FAQ_LANGUAGES = ("hi", "mr", "ta", "te")
+
+# Postgres ships no Indic text search configurations; 'simple' lowercases
+# and splits on word boundaries without stemming
+DOCUMENT_VECTOR = (
+    "to_tsvector(CASE WHEN language = 'en' THEN 'english'::regconfig ELSE 'simple'::regconfig END, "
+    "coalesce(content, ''))"
+)
+
+
+def _faq_vector(language: str) -> str:
+    if language == "en":
+        return (
+            "setweight(to_tsvector('english', coalesce(question_en, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(answer_en, '')), 'D')"
+        )
+    # Queries arrive translated to English, so the English question is indexed too
+    return (
+        f"setweight(to_tsvector('simple', coalesce(question_{language}, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(question_en, '')), 'A') || "
+        f"setweight(to_tsvector('simple', coalesce(answer_{language}, '')), 'D')"
+    )
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    for language in ("en",) + FAQ_LANGUAGES:
+        op.execute(f"ALTER TABLE faqs ADD COLUMN search_{language} tsvector GENERATED ALWAYS AS ({_faq_vector(language)}) STORED")
+        op.execute(f"CREATE INDEX ix_faqs_search_{language} ON faqs USING gin (search_{language})")
+        op.execute(f"CREATE INDEX ix_faqs_question_{language}_trgm ON faqs USING gin (question_{language} gin_trgm_ops)")
+
+    for table in ("documents", "document_chunks"):
+        op.execute(f"ALTER TABLE {table} ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({DOCUMENT_VECTOR}) STORED")
+        op.execute(f"CREATE INDEX ix_{table}_search_vector ON {table} USING gin (search_vector)")
+
+
+def downgrade():
+    for table in ("documents", "document_chunks"):
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_search_vector")
+        op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
+
+    for language in ("en",) + FAQ_LANGUAGES:
+        op.execute(f"DROP INDEX IF EXISTS ix_faqs_question_{language}_trgm")
+        op.execute(f"DROP INDEX IF EXISTS ix_faqs_search_{language}")
+        op.execute(f"ALTER TABLE faqs DROP COLUMN IF EXISTS search_{language}")
+    # pg_trgm is left installed; other schemas may rely on it
@@ -11,6 +11,7 @@ class CampusAIChatWidget {
             position: config.position || 'bottom-right',
             language: config.language || 'en',
             welcomeMessage: config.welcomeMessage || null,
+            streaming: config.streaming !== false,  // Render replies progressively over SSE
             ...config
         };
         
@@ -264,56 +265,171 @@ class CampusAIChatWidget {
         // Show typing indicator
         this.showTypingIndicator();
         
+        const payload = {
+            message: message,
+            conversation_id: this.conversationId,
+            platform: 'web',
+            language: this.currentLanguage,
+            website_domain: window.location.hostname
+        };
+        
         try {
-            const response = await this.callAPI('/chat/message', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify({
-                    message: message,
-                    conversation_id: this.conversationId,
-                    platform: 'web',
-                    language: this.currentLanguage,
-                    website_domain: window.location.hostname
-                })
+            if (this.config.streaming && window.ReadableStream && window.TextDecoder) {
+                await this.streamReply(payload);
+            } else {
+                await this.fetchReply(payload);
+            }
+        } catch (error) {
+            console.error('Chat API Error:', error);
+            this.addMessage('bot', 'Sorry, I\'m having trouble connecting. Please check your internet connection and try again.', {
+                isError: true
+            });
+        } finally {
+            this.hideTypingIndicator();
+        }
+    }
+    
+    async fetchReply(payload) {
+        const response = await this.callAPI('/chat/message', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify(payload)
+        });
+        
+        const data = await response.json();
+        
+        if (response.ok) {
+            this.conversationId = data.conversation_id;
+            
+            // Add bot response
+            this.addMessage('bot', data.response, {
+                confidence: data.confidence,
+                source: data.source,
+                suggestions: data.suggestions
             });
             
-            const data = await response.json();
+            this.applyDetectedLanguage(data.detected_language);
             
-            if (response.ok) {
+            // Handle escalation
+            if (data.escalate) {
+                this.handleEscalation();
+            }
+            
+        } else {
+            this.addMessage('bot', 'Sorry, I encountered an error. Please try again.', {
+                isError: true
+            });
+        }
+    }
+    
+    async streamReply(payload) {
+        // EventSource cannot POST, so read the SSE stream from fetch directly
+        const response = await this.callAPI('/chat/message/stream', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'Accept': 'text/event-stream'
+            },
+            body: JSON.stringify(payload)
+        });
+        
+        if (!response.ok || !response.body) {
+            this.addMessage('bot', 'Sorry, I encountered an error. Please try again.', {
+                isError: true
+            });
+            return;
+        }
+        
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let reply = null;
+        
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            
+            // Events are separated by a blank line
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const event = this.parseSSE(buffer.slice(0, boundary));
+                buffer = buffer.slice(boundary + 2);
+                if (event) {
+                    reply = this.handleStreamEvent(event.type, event.data, reply);
+                }
+            }
+        }
+    }
+    
+    parseSSE(block) {
+        let type = 'message';
+        const dataLines = [];
+        block.split('\n').forEach(line => {
+            if (line.startsWith('event:')) {
+                type = line.slice(6).trim();
+            } else if (line.startsWith('data:')) {
+                dataLines.push(line.slice(5).trim());
+            }
+        });
+        if (dataLines.length === 0) return null;
+        return { type, data: JSON.parse(dataLines.join('\n')) };
+    }
+    
+    handleStreamEvent(type, data, reply) {
+        switch (type) {
+            case 'nlu':
                 this.conversationId = data.conversation_id;
-                
-                // Add bot response
-                this.addMessage('bot', data.response, {
-                    confidence: data.confidence,
-                    source: data.source,
-                    suggestions: data.suggestions
-                });
-                
-                // Update language if detected differently
-                if (data.detected_language !== this.currentLanguage) {
-                    this.currentLanguage = data.detected_language;
-                    document.getElementById('language-select').value = this.currentLanguage;
+                this.applyDetectedLanguage(data.detected_language);
+                return reply;
+            case 'answer':
+                if (!reply) {
+                    // First chunk replaces the typing indicator with the reply bubble
+                    this.hideTypingIndicator();
+                    reply = this.addMessage('bot', '');
+                }
+                reply.text.textContent += data.text;
+                reply.entry.text += data.text;
+                this.scrollToBottom();
+                return reply;
+            case 'suggestions':
+                if (reply) {
+                    reply.entry.metadata = {
+                        confidence: data.confidence,
+                        source: data.source,
+                        suggestions: data.suggestions
+                    };
+                    if (data.confidence) {
+                        const score = document.createElement('div');
+                        score.className = 'confidence-score';
+                        score.textContent = `Confidence: ${Math.round(data.confidence * 100)}%`;
+                        reply.text.parentNode.appendChild(score);
+                    }
+                }
+                if (data.suggestions && data.suggestions.length > 0) {
+                    this.updateSuggestions(data.suggestions);
                 }
-                
-                // Handle escalation
                 if (data.escalate) {
                     this.handleEscalation();
                 }
-                
-            } else {
+                return reply;
+            case 'error':
                 this.addMessage('bot', 'Sorry, I encountered an error. Please try again.', {
                     isError: true
                 });
-            }
-        } catch (error) {
-            console.error('Chat API Error:', error);
-            this.addMessage('bot', 'Sorry, I\'m having trouble connecting. Please check your internet connection and try again.', {
-                isError: true
-            });
-        } finally {
-            this.hideTypingIndicator();
+                return reply;
+            default:
+                return reply;
+        }
+    }
+    
+    applyDetectedLanguage(detectedLanguage) {
+        // Update language if detected differently
+        if (detectedLanguage && detectedLanguage !== this.currentLanguage) {
+            this.currentLanguage = detectedLanguage;
+            document.getElementById('language-select').value = this.currentLanguage;
         }
     }
     
@@ -350,12 +466,15 @@ class CampusAIChatWidget {
         this.scrollToBottom();
         
         // Store in history
-        this.messageHistory.push({
+        const entry = {
             sender,
             text,
             timestamp: now,
             metadata
-        });
+        };
+        this.messageHistory.push(entry);
+        
+        return { element: messageDiv, text: messageDiv.querySelector('.message-content p'), entry };
     }
     
     updateSuggestions(suggestions) {
@@ -535,6 +654,7 @@ class CampusAIChatWidget {
             position: config.position || 'bottom-right',
             language: config.language || 'en',
             welcomeMessage: config.welcomeMessage || null,
+            streaming: config.streaming !== false,  // Render replies progressively over SSE
             ...config
         };
         
@@ -788,56 +908,171 @@ class CampusAIChatWidget {
         // Show typing indicator
         this.showTypingIndicator();
         
+        const payload = {
+            message: message,
+            conversation_id: this.conversationId,
+            platform: 'web',
+            language: this.currentLanguage,
+            website_domain: window.location.hostname
+        };
+        
         try {
-            const response = await this.callAPI('/chat/message', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify({
-                    message: message,
-                    conversation_id: this.conversationId,
-                    platform: 'web',
-                    language: this.currentLanguage,
-                    website_domain: window.location.hostname
-                })
+            if (this.config.streaming && window.ReadableStream && window.TextDecoder) {
+                await this.streamReply(payload);
+            } else {
+                await this.fetchReply(payload);
+            }
+        } catch (error) {
+            console.error('Chat API Error:', error);
+            this.addMessage('bot', 'Sorry, I\'m having trouble connecting. Please check your internet connection and try again.', {
+                isError: true
+            });
+        } finally {
+            this.hideTypingIndicator();
+        }
+    }
+    
+    async fetchReply(payload) {
+        const response = await this.callAPI('/chat/message', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify(payload)
+        });
+        
+        const data = await response.json();
+        
+        if (response.ok) {
+            this.conversationId = data.conversation_id;
+            
+            // Add bot response
+            this.addMessage('bot', data.response, {
+                confidence: data.confidence,
+                source: data.source,
+                suggestions: data.suggestions
             });
             
-            const data = await response.json();
+            this.applyDetectedLanguage(data.detected_language);
             
-            if (response.ok) {
+            // Handle escalation
+            if (data.escalate) {
+                this.handleEscalation();
+            }
+            
+        } else {
+            this.addMessage('bot', 'Sorry, I encountered an error. Please try again.', {
+                isError: true
+            });
+        }
+    }
+    
+    async streamReply(payload) {
+        // EventSource cannot POST, so read the SSE stream from fetch directly
+        const response = await this.callAPI('/chat/message/stream', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'Accept': 'text/event-stream'
+            },
+            body: JSON.stringify(payload)
+        });
+        
+        if (!response.ok || !response.body) {
+            this.addMessage('bot', 'Sorry, I encountered an error. Please try again.', {
+                isError: true
+            });
+            return;
+        }
+        
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let reply = null;
+        
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            
+            // Events are separated by a blank line
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const event = this.parseSSE(buffer.slice(0, boundary));
+                buffer = buffer.slice(boundary + 2);
+                if (event) {
+                    reply = this.handleStreamEvent(event.type, event.data, reply);
+                }
+            }
+        }
+    }
+    
+    parseSSE(block) {
+        let type = 'message';
+        const dataLines = [];
+        block.split('\n').forEach(line => {
+            if (line.startsWith('event:')) {
+                type = line.slice(6).trim();
+            } else if (line.startsWith('data:')) {
+                dataLines.push(line.slice(5).trim());
+            }
+        });
+        if (dataLines.length === 0) return null;
+        return { type, data: JSON.parse(dataLines.join('\n')) };
+    }
+    
+    handleStreamEvent(type, data, reply) {
+        switch (type) {
+            case 'nlu':
                 this.conversationId = data.conversation_id;
-                
-                // Add bot response
-                this.addMessage('bot', data.response, {
-                    confidence: data.confidence,
-                    source: data.source,
-                    suggestions: data.suggestions
-                });
-                
-                // Update language if detected differently
-                if (data.detected_language !== this.currentLanguage) {
-                    this.currentLanguage = data.detected_language;
-                    document.getElementById('language-select').value = this.currentLanguage;
+                this.applyDetectedLanguage(data.detected_language);
+                return reply;
+            case 'answer':
+                if (!reply) {
+                    // First chunk replaces the typing indicator with the reply bubble
+                    this.hideTypingIndicator();
+                    reply = this.addMessage('bot', '');
+                }
+                reply.text.textContent += data.text;
+                reply.entry.text += data.text;
+                this.scrollToBottom();
+                return reply;
+            case 'suggestions':
+                if (reply) {
+                    reply.entry.metadata = {
+                        confidence: data.confidence,
+                        source: data.source,
+                        suggestions: data.suggestions
+                    };
+                    if (data.confidence) {
+                        const score = document.createElement('div');
+                        score.className = 'confidence-score';
+                        score.textContent = `Confidence: ${Math.round(data.confidence * 100)}%`;
+                        reply.text.parentNode.appendChild(score);
+                    }
+                }
+                if (data.suggestions && data.suggestions.length > 0) {
+                    this.updateSuggestions(data.suggestions);
                 }
-                
-                // Handle escalation
                 if (data.escalate) {
                     this.handleEscalation();
                 }
-                
-            } else {
+                return reply;
+            case 'error':
                 this.addMessage('bot', 'Sorry, I encountered an error. Please try again.', {
                     isError: true
                 });
-            }
-        } catch (error) {
-            console.error('Chat API Error:', error);
-            this.addMessage('bot', 'Sorry, I\'m having trouble connecting. Please check your internet connection and try again.', {
-                isError: true
-            });
-        } finally {
-            this.hideTypingIndicator();
+                return reply;
+            default:
+                return reply;
+        }
+    }
+    
+    applyDetectedLanguage(detectedLanguage) {
+        // Update language if detected differently
+        if (detectedLanguage && detectedLanguage !== this.currentLanguage) {
+            this.currentLanguage = detectedLanguage;
+            document.getElementById('language-select').value = this.currentLanguage;
         }
     }
     
@@ -874,12 +1109,15 @@ class CampusAIChatWidget {
         this.scrollToBottom();
         
         // Store in history
-        this.messageHistory.push({
+        const entry = {
             sender,
             text,
             timestamp: now,
             metadata
-        });
+        };
+        this.messageHistory.push(entry);
+        
+        return { element: messageDiv, text: messageDiv.querySelector('.message-content p'), entry };
     }
     
     updateSuggestions(suggestions) {